@@ -46,12 +46,7 @@ class Economy(commands.Cog):
             await ctx.respond('❌ Role items require a role_id!', ephemeral=True)
             return
 
-        if 'shop_items' not in bot_data.data:
-            bot_data.data['shop_items'] = {}
-        if guild_id not in bot_data.data['shop_items']:
-            bot_data.data['shop_items'][guild_id] = {}
-
-        shop_items = bot_data.data['shop_items'][guild_id]
+        shop_items = await bot_data.get_shop_items(guild_id)
 
         if item_id in shop_items:
             await ctx.respond(f'❌ Item with ID `{item_id}` already exists!', ephemeral=True)
@@ -68,8 +63,7 @@ class Economy(commands.Cog):
             'creator': str(ctx.author.id)
         }
 
-        bot_data.data['shop_items'][guild_id] = shop_items
-        bot_data.save()
+        await bot_data.set_shop_items(guild_id, shop_items)
 
         embed = discord.Embed(
             title='✅ Item Created Successfully',
@@ -93,7 +87,7 @@ class Economy(commands.Cog):
     @discord.default_permissions(administrator=True)
     async def deleteitem(self, ctx, item_id: str):
         guild_id = str(ctx.guild.id)
-        shop_items = bot_data.get_shop_items(guild_id)
+        shop_items = await bot_data.get_shop_items(guild_id)
 
         if item_id not in shop_items:
             await ctx.respond(f'❌ Item `{item_id}` not found!', ephemeral=True)
@@ -101,8 +95,7 @@ class Economy(commands.Cog):
 
         item = shop_items[item_id]
         del shop_items[item_id]
-        bot_data.data['shop_items'][guild_id] = shop_items
-        bot_data.save()
+        await bot_data.set_shop_items(guild_id, shop_items)
 
         await ctx.respond(f'✅ Deleted item: **{item["name"]}** (`{item_id}`)', ephemeral=True)
 
@@ -111,7 +104,7 @@ class Economy(commands.Cog):
     @discord.default_permissions(administrator=True)
     async def listitems(self, ctx):
         guild_id = str(ctx.guild.id)
-        shop_items = bot_data.get_shop_items(guild_id)
+        shop_items = await bot_data.get_shop_items(guild_id)
 
         if not shop_items:
             await ctx.respond('📦 No items in shop yet. Use `/createitem` to add some!', ephemeral=True)
@@ -142,7 +135,7 @@ class Economy(commands.Cog):
         guild_id = str(ctx.guild.id)
         target = user or ctx.author
         user_id = str(target.id)
-        economy_data = bot_data.get_user_economy(guild_id, user_id)
+        economy_data = await bot_data.get_user_economy(guild_id, user_id)
 
         embed = discord.Embed(
             title=f'💰 {target.display_name}\'s Balance',
@@ -165,11 +158,16 @@ class Economy(commands.Cog):
     async def daily(self, ctx):
         guild_id = str(ctx.guild.id)
         user_id = str(ctx.author.id)
-        economy_data = bot_data.get_user_economy(guild_id, user_id)
         now = datetime.utcnow().timestamp()
+        reward = random.randint(Config.DAILY_MIN, Config.DAILY_MAX)
+
+        economy_data = await bot_data.claim_cooldown(
+            guild_id, user_id, 'lastDaily', Config.DAILY_COOLDOWN, now, inc={'coins': reward}
+        )
 
-        if now - economy_data.get('lastDaily', 0) < Config.DAILY_COOLDOWN:
-            time_left = Config.DAILY_COOLDOWN - (now - economy_data.get('lastDaily', 0))
+        if economy_data is None:
+            economy_data = await bot_data.get_user_economy(guild_id, user_id)
+            time_left = max(0, Config.DAILY_COOLDOWN - (now - economy_data.get('lastDaily', 0)))
             hours = int(time_left // 3600)
             minutes = int((time_left % 3600) // 60)
             await ctx.respond(
@@ -178,12 +176,6 @@ class Economy(commands.Cog):
             )
             return
 
-        reward = random.randint(Config.DAILY_MIN, Config.DAILY_MAX)
-        economy_data['coins'] += reward
-        economy_data['lastDaily'] = now
-        bot_data.set_user_economy(guild_id, user_id, economy_data)
-        bot_data.save()
-
         embed = discord.Embed(
             title='🎁 Daily Reward Claimed!',
             description=f'You received **{reward:,} coins**!',
@@ -198,28 +190,28 @@ class Economy(commands.Cog):
     async def work(self, ctx):
         guild_id = str(ctx.guild.id)
         user_id = str(ctx.author.id)
-        economy_data = bot_data.get_user_economy(guild_id, user_id)
         now = datetime.utcnow().timestamp()
 
-        if now - economy_data.get('lastWork', 0) < Config.WORK_COOLDOWN:
-            time_left = Config.WORK_COOLDOWN - (now - economy_data.get('lastWork', 0))
-            minutes = int(time_left // 60)
-            await ctx.respond(
-                f'⏳ You need to rest! Come back in **{minutes}m**',
-                ephemeral=True
-            )
-            return
-
         jobs = [
             'programmer', 'chef', 'teacher', 'doctor', 'artist',
             'musician', 'writer', 'engineer', 'designer', 'scientist'
         ]
         job = random.choice(jobs)
         reward = random.randint(Config.WORK_MIN, Config.WORK_MAX)
-        economy_data['coins'] += reward
-        economy_data['lastWork'] = now
-        bot_data.set_user_economy(guild_id, user_id, economy_data)
-        bot_data.save()
+
+        economy_data = await bot_data.claim_cooldown(
+            guild_id, user_id, 'lastWork', Config.WORK_COOLDOWN, now, inc={'coins': reward}
+        )
+
+        if economy_data is None:
+            economy_data = await bot_data.get_user_economy(guild_id, user_id)
+            time_left = max(0, Config.WORK_COOLDOWN - (now - economy_data.get('lastWork', 0)))
+            minutes = int(time_left // 60)
+            await ctx.respond(
+                f'⏳ You need to rest! Come back in **{minutes}m**',
+                ephemeral=True
+            )
+            return
 
         embed = discord.Embed(
             title=f'💼 You worked as a {job}!',
@@ -234,7 +226,7 @@ class Economy(commands.Cog):
     @discord.slash_command(name='shop', description='Browse the shop')
     async def shop(self, ctx):
         guild_id = str(ctx.guild.id)
-        shop_items = bot_data.get_shop_items(guild_id)
+        shop_items = await bot_data.get_shop_items(guild_id)
 
         if not shop_items:
             await ctx.respond('🛒 The shop is empty right now. Check back later!')
@@ -276,7 +268,7 @@ class Economy(commands.Cog):
             embed.add_field(name='✨ Consumables', value=consumable_text, inline=False)
 
         user_id = str(ctx.author.id)
-        economy_data = bot_data.get_user_economy(guild_id, user_id)
+        economy_data = await bot_data.get_user_economy(guild_id, user_id)
         embed.set_footer(
             text=f'Your balance: {economy_data["coins"]:,} coins | Use /inventory to see owned items'
         )
@@ -288,7 +280,7 @@ class Economy(commands.Cog):
     @option("item_id", str, description="Item ID to purchase (see /shop)")
     async def buy(self, ctx, item_id: str):
         guild_id = str(ctx.guild.id)
-        shop_items = bot_data.get_shop_items(guild_id)
+        shop_items = await bot_data.get_shop_items(guild_id)
 
         if item_id not in shop_items:
             await ctx.respond('❌ Invalid item ID! Use `/shop` to see available items.', ephemeral=True)
@@ -297,24 +289,22 @@ class Economy(commands.Cog):
         item = shop_items[item_id]
         user_id = str(ctx.author.id)
 
-        inventory = bot_data.get_user_inventory(guild_id, user_id)
+        inventory = await bot_data.get_user_inventory(guild_id, user_id)
         if item_id in inventory and item['type'] != 'consumable':
             await ctx.respond(f'❌ You already own **{item["name"]}**!', ephemeral=True)
             return
 
-        economy_data = bot_data.get_user_economy(guild_id, user_id)
-        if economy_data['coins'] < item['price']:
-            needed = item['price'] - economy_data['coins']
+        economy_data = await bot_data.spend_coins(guild_id, user_id, item['price'])
+        if economy_data is None:
+            economy_data = await bot_data.get_user_economy(guild_id, user_id)
+            needed = max(1, item['price'] - economy_data['coins'])
             await ctx.respond(
                 f'❌ You need **{needed:,}** more coins to buy **{item["name"]}**!',
                 ephemeral=True
             )
             return
 
-        economy_data['coins'] -= item['price']
-        bot_data.set_user_economy(guild_id, user_id, economy_data)
-        bot_data.add_to_inventory(guild_id, user_id, item_id)
-        bot_data.save()
+        await bot_data.add_to_inventory(guild_id, user_id, item_id)
 
         if item['type'] == 'role' and item.get('role_id'):
             role = ctx.guild.get_role(int(item['role_id']))
@@ -353,8 +343,8 @@ class Economy(commands.Cog):
     async def inventory(self, ctx):
         guild_id = str(ctx.guild.id)
         user_id = str(ctx.author.id)
-        inventory = bot_data.get_user_inventory(guild_id, user_id)
-        shop_items = bot_data.get_shop_items(guild_id)
+        inventory = await bot_data.get_user_inventory(guild_id, user_id)
+        shop_items = await bot_data.get_shop_items(guild_id)
 
         if not inventory:
             await ctx.respond('📦 Your inventory is empty! Visit `/shop` to buy items.')
@@ -396,20 +386,9 @@ class Economy(commands.Cog):
         if everyone:
             await ctx.defer()  # Important for long operations
 
-            members = [m for m in ctx.guild.members if not m.bot]
-            count = 0
-
-            logger.info(f"Starting global give: {amount} coins to {len(members)} members")
-
-            for member in members:
-                user_id = str(member.id)
-                economy_data = bot_data.get_user_economy(guild_id, user_id)
-                economy_data['coins'] += amount
-                bot_data.set_user_economy(guild_id, user_id, economy_data)
-                count += 1
-
-            bot_data.save()
-            logger.info(f"✅ Gave {amount} coins to {count} members, data saved")
+            logger.info(f"Starting global give: {amount} coins in guild {guild_id}")
+            count, status = await self.adjust_everyone(ctx, amount)
+            logger.info(f"✅ Gave {amount} coins to {count} members")
 
             embed = discord.Embed(
                 title="💸 Global Giveaway!",
@@ -418,7 +397,7 @@ class Economy(commands.Cog):
                 timestamp=datetime.utcnow()
             )
             embed.set_footer(text=f'Given by {ctx.author.display_name}')
-            await ctx.followup.send(embed=embed)
+            await status.edit(content=None, embed=embed)
             return
 
         if not user:
@@ -426,10 +405,7 @@ class Economy(commands.Cog):
             return
 
         user_id = str(user.id)
-        economy_data = bot_data.get_user_economy(guild_id, user_id)
-        economy_data['coins'] += amount
-        bot_data.set_user_economy(guild_id, user_id, economy_data)
-        bot_data.save()
+        economy_data = await bot_data.increment_economy(guild_id, user_id, {'coins': amount})
 
         embed = discord.Embed(
             title='💸 Coins Given!',
@@ -441,6 +417,18 @@ class Economy(commands.Cog):
         embed.set_footer(text=f'Given by {ctx.author.display_name}')
         await ctx.respond(embed=embed)
 
+    async def adjust_everyone(self, ctx, amount: int):
+        """Bulk add (or, with a negative amount, remove) coins for every non-bot member, reporting progress in a followup"""
+        total = ctx.guild.member_count or len(ctx.guild.members)
+        status = await ctx.followup.send(f'⏳ Updating balances... 0 / ~{total:,} members', wait=True)
+
+        async def report(done: int):
+            await status.edit(content=f'⏳ Updating balances... {done:,} / ~{total:,} members')
+
+        member_ids = (str(m.id) for m in ctx.guild.members if not m.bot)
+        count = await bot_data.bulk_adjust_coins(str(ctx.guild.id), member_ids, amount, progress=report)
+        return count, status
+
     # -------------------- RESET ECONOMY -------------------- #
     @discord.slash_command(name='reseteconomy', description='[ADMIN] Reset ALL economy data for this server')
     @discord.default_permissions(administrator=True)
@@ -456,11 +444,7 @@ class Economy(commands.Cog):
                 )
                 return
 
-            if guild_id in bot_data.data.get('economy', {}):
-                del bot_data.data['economy'][guild_id]
-            if guild_id in bot_data.data.get('inventory', {}):
-                del bot_data.data['inventory'][guild_id]
-            bot_data.save()
+            await bot_data.reset_guild_economy(guild_id)
 
             embed = discord.Embed(
                 title='✅ Economy Reset Complete',
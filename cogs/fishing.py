@@ -20,17 +20,8 @@ class Fishing(commands.Cog):
     async def fish(self, ctx):
         guild_id = str(ctx.guild.id)
         user_id = str(ctx.author.id)
-        economy_data = bot_data.get_user_economy(guild_id, user_id)
         now = datetime.utcnow().timestamp()
         
-        if now - economy_data.get('lastFish', 0) < Config.FISH_COOLDOWN:
-            time_left = Config.FISH_COOLDOWN - (now - economy_data.get('lastFish', 0))
-            await ctx.respond(
-                f'⏳ Your fishing rod needs to rest! Come back in **{int(time_left)}s**',
-                ephemeral=True
-            )
-            return
-        
         total_weight = sum(o['weight'] for o in FISH_TYPES)
         rand = random.uniform(0, total_weight)
         current = 0
@@ -41,18 +32,24 @@ class Fishing(commands.Cog):
                 catch = outcome
                 break
         
-        if 'fishInventory' not in economy_data:
-            economy_data['fishInventory'] = {}
-        
         fish_key = catch['name']
-        if fish_key not in economy_data['fishInventory']:
-            economy_data['fishInventory'][fish_key] = {'count': 0, 'emoji': catch['emoji'], 'value': catch['value']}
+        economy_data = await bot_data.claim_cooldown(
+            guild_id, user_id, 'lastFish', Config.FISH_COOLDOWN, now,
+            inc={'fishCaught': 1, f'fishInventory.{fish_key}.count': 1},
+            extra={'$set': {
+                f'fishInventory.{fish_key}.emoji': catch['emoji'],
+                f'fishInventory.{fish_key}.value': catch['value']
+            }}
+        )
         
-        economy_data['fishInventory'][fish_key]['count'] += 1
-        economy_data['lastFish'] = now
-        economy_data['fishCaught'] = economy_data.get('fishCaught', 0) + 1
-        bot_data.set_user_economy(guild_id, user_id, economy_data)
-        bot_data.save()
+        if economy_data is None:
+            economy_data = await bot_data.get_user_economy(guild_id, user_id)
+            time_left = max(0, Config.FISH_COOLDOWN - (now - economy_data.get('lastFish', 0)))
+            await ctx.respond(
+                f'⏳ Your fishing rod needs to rest! Come back in **{int(time_left)}s**',
+                ephemeral=True
+            )
+            return
         
         rarity = '⭐⭐⭐ LEGENDARY' if catch['value'] >= 1000 else '⭐⭐ RARE' if catch['value'] >= 200 else '⭐ UNCOMMON' if catch['value'] >= 100 else 'COMMON'
         
@@ -74,8 +71,8 @@ class Fishing(commands.Cog):
     async def fishbag(self, ctx):
         guild_id = str(ctx.guild.id)
         user_id = str(ctx.author.id)
-        economy_data = bot_data.get_user_economy(guild_id, user_id)
-        fish_inventory = economy_data.get('fishInventory', {})
+        economy_data = await bot_data.get_user_economy(guild_id, user_id)
+        fish_inventory = {name: data for name, data in economy_data.get('fishInventory', {}).items() if data.get('count', 0) > 0}
         
         if not fish_inventory:
             await ctx.respond('🎣 Your fish bag is empty! Use `/fish` to catch some fish!')
@@ -112,8 +109,8 @@ class Fishing(commands.Cog):
     async def sellfish(self, ctx, fish_name: str):
         guild_id = str(ctx.guild.id)
         user_id = str(ctx.author.id)
-        economy_data = bot_data.get_user_economy(guild_id, user_id)
-        fish_inventory = economy_data.get('fishInventory', {})
+        economy_data = await bot_data.get_user_economy(guild_id, user_id)
+        fish_inventory = {name: data for name, data in economy_data.get('fishInventory', {}).items() if data.get('count', 0) > 0}
         
         if not fish_inventory:
             await ctx.respond('❌ You don\'t have any fish to sell! Use `/fish` first.', ephemeral=True)
@@ -122,18 +119,20 @@ class Fishing(commands.Cog):
         if fish_name.lower() == 'all':
             total_earned = 0
             fish_sold = []
+            sold_counts = {}
             
             for fish, data in fish_inventory.items():
                 count = data['count']
                 value = data['value']
                 earnings = count * value
                 total_earned += earnings
+                sold_counts[f'fishInventory.{fish}.count'] = -count
                 fish_sold.append(f"{data['emoji']} {fish} x{count} = {earnings:,} coins")
             
-            economy_data['coins'] += total_earned
-            economy_data['fishInventory'] = {}
-            bot_data.set_user_economy(guild_id, user_id, economy_data)
-            bot_data.save()
+            # Decrement exactly what was sold so a catch landing meanwhile is kept
+            economy_data = await bot_data.increment_economy(
+                guild_id, user_id, {'coins': total_earned, **sold_counts}
+            )
             
             embed = discord.Embed(
                 title='💰 Fish Sold!',
@@ -165,10 +164,9 @@ class Fishing(commands.Cog):
             value = fish_data['value']
             total_earned = count * value
             
-            economy_data['coins'] += total_earned
-            del economy_data['fishInventory'][matched_fish]
-            bot_data.set_user_economy(guild_id, user_id, economy_data)
-            bot_data.save()
+            economy_data = await bot_data.increment_economy(
+                guild_id, user_id, {'coins': total_earned, f'fishInventory.{matched_fish}.count': -count}
+            )
             
             embed = discord.Embed(
                 title='💰 Fish Sold!',
@@ -22,7 +22,7 @@ class Gambling(commands.Cog):
     async def gamble(self, ctx, game: str, amount: int):
         guild_id = str(ctx.guild.id)
         user_id = str(ctx.author.id)
-        economy_data = bot_data.get_user_economy(guild_id, user_id)
+        economy_data = await bot_data.get_user_economy(guild_id, user_id)
         
         max_bet = int(economy_data['coins'] * Config.GAMBLE_MAX_PERCENT)
         if amount > max_bet:
@@ -46,26 +46,27 @@ class Gambling(commands.Cog):
             result = self.play_roulette(amount)
         
         if result['won']:
-            economy_data['coins'] += result['winnings']
-            economy_data['gamblingWins'] = economy_data.get('gamblingWins', 0) + 1
-            economy_data['currentStreak'] = economy_data.get('currentStreak', 0) + 1
+            economy_data = await bot_data.increment_economy(
+                guild_id, user_id,
+                {'coins': result['winnings'], 'gamblingWins': 1, 'currentStreak': 1, 'totalGambled': amount},
+                extra={'$max': {'biggestWin': result['winnings']}}
+            )
             
             if economy_data['currentStreak'] > economy_data.get('winStreak', 0):
-                economy_data['winStreak'] = economy_data['currentStreak']
-            
-            if result['winnings'] > economy_data.get('biggestWin', 0):
-                economy_data['biggestWin'] = result['winnings']
+                economy_data = await bot_data.increment_economy(
+                    guild_id, user_id, {},
+                    extra={'$max': {'winStreak': economy_data['currentStreak']}}
+                )
         else:
-            economy_data['coins'] -= amount
-            economy_data['gamblingLosses'] = economy_data.get('gamblingLosses', 0) + 1
-            economy_data['currentStreak'] = 0
+            economy_data = await bot_data.spend_coins(
+                guild_id, user_id, amount,
+                inc={'gamblingLosses': 1, 'totalGambled': amount},
+                extra={'$set': {'currentStreak': 0}, '$max': {'biggestLoss': amount}}
+            )
             
-            if amount > economy_data.get('biggestLoss', 0):
-                economy_data['biggestLoss'] = amount
-        
-        economy_data['totalGambled'] = economy_data.get('totalGambled', 0) + amount
-        bot_data.set_user_economy(guild_id, user_id, economy_data)
-        bot_data.save()
+            if economy_data is None:
+                await ctx.respond('❌ You don\'t have enough coins!', ephemeral=True)
+                return
         
         embed = result['embed']
         embed.set_footer(text=f'⚠️ Gamble responsibly! Win Streak: {economy_data["currentStreak"]}')
@@ -78,7 +79,7 @@ class Gambling(commands.Cog):
         guild_id = str(ctx.guild.id)
         target = user or ctx.author
         user_id = str(target.id)
-        economy_data = bot_data.get_user_economy(guild_id, user_id)
+        economy_data = await bot_data.get_user_economy(guild_id, user_id)
         
         total_games = economy_data.get('gamblingWins', 0) + economy_data.get('gamblingLosses', 0)
         
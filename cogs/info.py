@@ -50,17 +50,12 @@ class Info(commands.Cog):
     async def botinfo(self, ctx):
         guild_id = str(ctx.guild.id)
         
-        total_users_global = sum(len(guild_data) for guild_data in bot_data.data.get('levels', {}).values())
-        total_users_server = len(bot_data.data.get('levels', {}).get(guild_id, {}))
+        stats = await bot_data.get_global_stats(guild_id)
+        total_users_global = stats['users_global']
+        total_users_server = stats['users_server']
         
-        total_coins_global = sum(
-            sum(e.get('coins', 0) + e.get('bank', 0) for e in guild_data.values())
-            for guild_data in bot_data.data.get('economy', {}).values()
-        )
-        total_coins_server = sum(
-            e.get('coins', 0) + e.get('bank', 0) 
-            for e in bot_data.data.get('economy', {}).get(guild_id, {}).values()
-        )
+        total_coins_global = stats['coins_global']
+        total_coins_server = stats['coins_server']
         
         total_guilds = len(self.bot.guilds)
         total_commands = len([cmd for cmd in self.bot.walk_application_commands()])
@@ -69,7 +64,7 @@ class Info(commands.Cog):
         memory_usage = process.memory_info().rss / 1024 / 1024
         
         # Get bot customizations for this server
-        bot_profile = bot_data.get_bot_profile(guild_id)
+        bot_profile = await bot_data.get_bot_profile(guild_id)
         bot_name = bot_profile.get('customName', 'Tooly Bot')
         bot_pfp = bot_profile.get('customPfp', self.bot.user.avatar.url if self.bot.user.avatar else None)
         
@@ -116,9 +111,10 @@ class Info(commands.Cog):
         target = user or ctx.author
         user_id = str(target.id)
         
-        level_data = bot_data.get_user_level(guild_id, user_id)
-        economy_data = bot_data.get_user_economy(guild_id, user_id)
-        profile_data = bot_data.get_user_profile(guild_id, user_id)
+        member_data = await bot_data.get_member(guild_id, user_id, ('level', 'economy', 'profile'))
+        level_data = member_data['level']
+        economy_data = member_data['economy']
+        profile_data = member_data['profile']
         
         # Use custom name or default display name
         display_name = profile_data.get('customName', target.display_name)
@@ -168,7 +164,7 @@ class Info(commands.Cog):
             await ctx.respond(embed=embed, ephemeral=True)
             return
         
-        profile_data = bot_data.get_user_profile(guild_id, user_id)
+        profile_data = await bot_data.get_user_profile(guild_id, user_id)
         changes = []
         
         # Update custom name
@@ -200,7 +196,7 @@ class Info(commands.Cog):
             profile_data['customPfp'] = pfp
             changes.append(f"**Profile Picture:** Set")
         
-        bot_data.set_user_profile(guild_id, user_id, profile_data)
+        await bot_data.set_user_profile(guild_id, user_id, profile_data)
         
         embed = discord.Embed(
             title='✅ Profile Customized!',
@@ -232,7 +228,7 @@ class Info(commands.Cog):
             await ctx.respond(embed=embed, ephemeral=True)
             return
         
-        bot_profile = bot_data.get_bot_profile(guild_id)
+        bot_profile = await bot_data.get_bot_profile(guild_id)
         changes = []
         
         # Update bot name
@@ -266,7 +262,7 @@ class Info(commands.Cog):
             changes.append(f"**Profile Picture:** Updated")
             logger.info(f"Bot pfp customized in guild {guild_id}")
         
-        bot_data.set_bot_profile(guild_id, bot_profile)
+        await bot_data.set_bot_profile(guild_id, bot_profile)
         
         embed = discord.Embed(
             title='✅ Bot Customized!',
@@ -287,11 +283,11 @@ class Info(commands.Cog):
     async def resetbot(self, ctx):
         guild_id = str(ctx.guild.id)
         
-        bot_profile = bot_data.get_bot_profile(guild_id)
+        bot_profile = await bot_data.get_bot_profile(guild_id)
         bot_profile.pop('customName', None)
         bot_profile.pop('customPfp', None)
         
-        bot_data.set_bot_profile(guild_id, bot_profile)
+        await bot_data.set_bot_profile(guild_id, bot_profile)
         
         embed = discord.Embed(
             title='✅ Bot Profile Reset!',
@@ -306,13 +302,13 @@ class Info(commands.Cog):
         guild_id = str(ctx.guild.id)
         user_id = str(ctx.author.id)
         
-        profile_data = bot_data.get_user_profile(guild_id, user_id)
+        profile_data = await bot_data.get_user_profile(guild_id, user_id)
         
         # Clear custom settings
         profile_data.pop('customName', None)
         profile_data.pop('customPfp', None)
         
-        bot_data.set_user_profile(guild_id, user_id, profile_data)
+        await bot_data.set_user_profile(guild_id, user_id, profile_data)
         
         embed = discord.Embed(
             title='✅ Profile Reset!',
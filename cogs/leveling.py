@@ -3,9 +3,12 @@ from discord.ext import commands, tasks
 from discord import option
 from datetime import datetime
 from typing import Optional
+import asyncio
+import hashlib
 import random
 import logging
 from utils.database import bot_data
+from utils.cache import CooldownIndex
 from utils.config import Config
 
 
@@ -14,6 +17,8 @@ logger = logging.getLogger('tooly_bot.leveling')
 class Leveling(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        # Last XP award per (guild_id, user_id) so cooldown hits never touch Mongo
+        self.xp_cooldowns = CooldownIndex(Config.XP_COOLDOWN, Config.XP_COOLDOWN_INDEX_SIZE)
         self.autosave.start()
         self.update_leaderboard.start()
     
@@ -29,12 +34,18 @@ class Leveling(commands.Cog):
         
         guild_id = str(message.guild.id)
         user_id = str(message.author.id)
+        now = datetime.utcnow().timestamp()
+        
+        if self.xp_cooldowns.is_active((guild_id, user_id), now):
+            return
         
         # FIX: Added guild_id parameter
-        user_data = bot_data.get_user_level(guild_id, user_id)
-        now = datetime.utcnow().timestamp()
+        user_data = await bot_data.get_user_level(guild_id, user_id)
         
-        if now - user_data['lastMessage'] >= Config.XP_COOLDOWN:
+        if now - user_data['lastMessage'] < Config.XP_COOLDOWN:
+            self.xp_cooldowns.touch((guild_id, user_id), user_data['lastMessage'])
+        else:
+            self.xp_cooldowns.touch((guild_id, user_id), now)
             user_data['lastMessage'] = now
             xp_gain = random.randint(Config.XP_MIN, Config.XP_MAX)
             user_data['xp'] += xp_gain
@@ -52,15 +63,13 @@ class Leveling(commands.Cog):
                 ]
                 
                 coin_reward = user_data['level'] * Config.LEVEL_UP_MULTIPLIER
-                economy_data = bot_data.get_user_economy(guild_id, user_id)
-                economy_data['coins'] += coin_reward
-                bot_data.set_user_economy(guild_id, user_id, economy_data)
+                await bot_data.increment_economy(guild_id, user_id, {'coins': coin_reward})
                 
                 await message.channel.send(
                     f'{random.choice(messages)} You earned **{coin_reward:,} coins**! 💰'
                 )
             
-            bot_data.set_user_level(guild_id, user_id, user_data)
+            await bot_data.set_user_level(guild_id, user_id, user_data)
     
     @discord.slash_command(name='rank', description='Check your rank and level')
     @option("user", discord.Member, description="User to check (optional)", required=False)
@@ -69,15 +78,17 @@ class Leveling(commands.Cog):
         guild_id = str(ctx.guild.id)
         user_id = str(target.id)
         
-        user_data = bot_data.get_user_level(guild_id, user_id)
-        economy_data = bot_data.get_user_economy(guild_id, user_id)
+        member_data = await bot_data.get_member(guild_id, user_id, ('level', 'economy'))
+        user_data = member_data['level']
+        economy_data = member_data['economy']
         xp_needed = user_data['level'] * Config.XP_PER_LEVEL
         
-        # FIX: Get all users for this guild
-        all_users = list(bot_data.levels_col.find({'guild_id': guild_id}))
-        all_users.sort(key=lambda x: (x.get('level', 1), x.get('xp', 0)), reverse=True)
-        
-        rank = next((i + 1 for i, u in enumerate(all_users) if u.get('user_id') == user_id), 'Unranked')
+        # Count the users ahead on the (guild_id, level, xp) index instead of loading the guild
+        total_users = await bot_data.get_ranked_user_count(guild_id)
+        if user_data['lastMessage']:
+            rank = await bot_data.get_user_rank(guild_id, user_data['level'], user_data['xp'])
+        else:
+            rank = 'Unranked'
         
         progress_percent = int((user_data['xp'] / xp_needed) * 100) if xp_needed > 0 else 0
         progress_bar = self.create_progress_bar(user_data['xp'], xp_needed, length=20)
@@ -96,7 +107,7 @@ class Leveling(commands.Cog):
         embed.set_thumbnail(url=target.display_avatar.url)
         
         embed.description = f"""
-**RANK** • #{rank} / {len(all_users)}
+**RANK** • #{rank} / {total_users}
 **LEVEL** • {user_data['level']}
 **XP** • {user_data['xp']:,} / {xp_needed:,} ({progress_percent}%)
 
@@ -121,7 +132,7 @@ class Leveling(commands.Cog):
     @discord.slash_command(name='leaderboard', description='View the server leaderboard')
     async def leaderboard(self, ctx):
         guild_id = str(ctx.guild.id)
-        embed = self.generate_leaderboard_embed(guild_id)
+        embed = await self.generate_leaderboard_embed(guild_id)
         await ctx.respond(embed=embed)
     
     @discord.slash_command(name='setleaderboard', description='[ADMIN] Set auto-updating leaderboard in this channel')
@@ -130,14 +141,15 @@ class Leveling(commands.Cog):
         await ctx.defer()
         
         guild_id = str(ctx.guild.id)
-        embed = self.generate_leaderboard_embed(guild_id)
+        embed = await self.generate_leaderboard_embed(guild_id)
         message = await ctx.channel.send(embed=embed)
         
         # FIX: Use proper method to store leaderboard messages
-        bot_data.set_leaderboard_message(
+        await bot_data.set_leaderboard_message(
             guild_id,
             str(ctx.channel.id),
-            str(message.id)
+            str(message.id),
+            fingerprint=self.leaderboard_fingerprint(embed)
         )
         
         await ctx.followup.send('✅ Auto-updating leaderboard created! It will update every hour.')
@@ -151,22 +163,18 @@ class Leveling(commands.Cog):
         percentage = int((current / total) * 100)
         return f'`{bar}` {percentage}%'
     
-    def generate_leaderboard_embed(self, guild_id: str):
-        # FIX: Query MongoDB directly for guild-specific leaderboard
-        all_users = list(bot_data.levels_col.find({'guild_id': guild_id}))
-        all_users.sort(key=lambda x: (x.get('level', 1), x.get('xp', 0)), reverse=True)
-        all_users = all_users[:10]
+    async def generate_leaderboard_embed(self, guild_id: str):
+        # Sorted, limited and joined with economy totals on the database side
+        top_users = await bot_data.get_leaderboard(guild_id, limit=10)
         
         description = []
-        for i, user_doc in enumerate(all_users):
+        for i, row in enumerate(top_users):
             medal = '🥇' if i == 0 else '🥈' if i == 1 else '🥉' if i == 2 else f'**{i+1}.**'
             
-            user_id = user_doc.get('user_id')
-            level = user_doc.get('level', 1)
-            xp = user_doc.get('xp', 0)
-            
-            economy_data = bot_data.get_user_economy(guild_id, user_id)
-            total_coins = economy_data.get('coins', 0) + economy_data.get('bank', 0)
+            user_id = row['user_id']
+            level = row['level']
+            xp = row['xp']
+            total_coins = row['total_coins']
             
             description.append(
                 f'{medal} <@{user_id}>\n'
@@ -182,44 +190,63 @@ class Leveling(commands.Cog):
         embed.set_footer(text='Updates every hour • Showing Level & Total Coins')
         return embed
     
+    def leaderboard_fingerprint(self, embed: discord.Embed) -> str:
+        """Hash of the rendered rankings (ignores the timestamp) to detect changes"""
+        return hashlib.sha1(embed.description.encode()).hexdigest()
+    
     @tasks.loop(seconds=Config.AUTOSAVE_INTERVAL)
     async def autosave(self):
-        # MongoDB auto-saves, but keep for compatibility
-        bot_data.save()
+        # Flush the write-behind level cache in one batch
+        await bot_data.save()
         logger.info('💾 Data autosaved')
     
     @tasks.loop(seconds=Config.LEADERBOARD_UPDATE_INTERVAL)
     async def update_leaderboard(self):
         try:
             # FIX: Query all guilds with leaderboard messages
-            leaderboard_docs = bot_data.leaderboards_col.find({})
+            leaderboard_docs = await bot_data.get_leaderboard_messages()
+            semaphore = asyncio.Semaphore(Config.LEADERBOARD_UPDATE_CONCURRENCY)
             
-            for doc in leaderboard_docs:
-                guild_id = doc.get('guild_id')
-                channel_id = doc.get('channel_id')
-                message_id = doc.get('message_id')
-                
-                if not all([guild_id, channel_id, message_id]):
-                    continue
-                
-                channel = self.bot.get_channel(int(channel_id))
-                if not channel:
-                    continue
-                    
-                try:
-                    message = await channel.fetch_message(int(message_id))
-                    embed = self.generate_leaderboard_embed(guild_id)
-                    await message.edit(embed=embed)
-                    logger.info(f'📊 Updated leaderboard for guild {guild_id}')
-                except discord.NotFound:
-                    # Delete invalid leaderboard message
-                    bot_data.leaderboards_col.delete_one({'guild_id': guild_id})
-                    logger.info(f'🗑️ Removed invalid leaderboard for guild {guild_id}')
-                except Exception as e:
-                    logger.error(f'❌ Error updating leaderboard for guild {guild_id}: {e}')
+            results = await asyncio.gather(
+                *(self.refresh_leaderboard(doc, semaphore) for doc in leaderboard_docs)
+            )
+            logger.info(f'📊 Leaderboards refreshed: {sum(results)} edited, {len(results) - sum(results)} unchanged/skipped')
         except Exception as e:
             logger.error(f'❌ Leaderboard update error: {e}')
     
+    async def refresh_leaderboard(self, doc: dict, semaphore: asyncio.Semaphore) -> bool:
+        """Re-render one stored leaderboard and edit it only if the rankings changed"""
+        guild_id = doc.get('guild_id')
+        channel_id = doc.get('channel_id')
+        message_id = doc.get('message_id')
+        
+        if not all([guild_id, channel_id, message_id]):
+            return False
+        
+        channel = self.bot.get_channel(int(channel_id))
+        if not channel:
+            return False
+        
+        async with semaphore:
+            try:
+                embed = await self.generate_leaderboard_embed(guild_id)
+                fingerprint = self.leaderboard_fingerprint(embed)
+                if fingerprint == doc.get('fingerprint'):
+                    return False
+                
+                # Edit through a partial message - no fetch_message round trip
+                await channel.get_partial_message(int(message_id)).edit(embed=embed)
+                await bot_data.set_leaderboard_fingerprint(guild_id, fingerprint)
+                logger.debug(f'📊 Updated leaderboard for guild {guild_id}')
+                return True
+            except discord.NotFound:
+                # Delete invalid leaderboard message
+                await bot_data.delete_leaderboard_message(guild_id)
+                logger.info(f'🗑️ Removed invalid leaderboard for guild {guild_id}')
+            except Exception as e:
+                logger.error(f'❌ Error updating leaderboard for guild {guild_id}: {e}')
+        return False
+    
     @autosave.before_loop
     async def before_autosave(self):
         await self.bot.wait_until_ready()
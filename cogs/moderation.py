@@ -1,41 +1,211 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import option
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from collections import deque
+from difflib import SequenceMatcher
+import asyncio
 import logging
-import json
-import os
+import re
+import time
+from utils.database import bot_data, timeout_store, server_settings
+from utils.scheduler import Scheduler
+from utils.cache import SlidingWindowCounter
+from utils.config import Config
 
 logger = logging.getLogger(__name__)
 
+
+async def banned_user_autocomplete(ctx: discord.AutocompleteContext):
+    cog = ctx.bot.get_cog('Moderation')
+    if not cog or not ctx.interaction.guild:
+        return []
+    return cog.search_bans(ctx.interaction.guild, ctx.value or '')
+
+
 class Moderation(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.timeout_file = "timeout_roles.json"
-        self._ensure_timeout_file()
+        # Pending timeout expirations - one sleeping task however many there are
+        self.expirations = Scheduler('timeouts')
+        # guild_id -> running Muted role permission setup
+        self.mute_jobs = {}
+        # Muted role id -> channel ids whose overwrite the bot couldn't edit (not retried on every /mute)
+        self.mute_setup_failed = {}
+        # guild_id -> channel id that receives forwarded DMs
+        self.modmail_routes = {}
+        # Automod state - all in memory so messages are checked without database calls
+        self.word_filters = {}  # guild_id -> (word list it was built from, compiled pattern or None)
+        self.recent_messages = {}  # (guild_id, user_id) -> deque of (timestamp, content hash)
+        self.automod_events = []  # pending log entries, posted in batches
+        # Raid protection state
+        self.join_rates = {}  # guild_id -> SlidingWindowCounter of joins
+        self.recent_joins = {}  # guild_id -> deque of (user_id, name, suspicious)
+        self.raid_mode = {}  # guild_id -> timestamp raid mode ends
+        self.raid_queue = asyncio.Queue()  # (guild_id, user_id, action) waiting to be applied
+        # guild_id -> {user_id: "name"} of banned users, filled on first /unban autocomplete
+        self.ban_index = {}
+        self.ban_index_jobs = {}
+        self.load_expirations.start()
+        self.process_raid_queue.start()
+        if Config.AUTOMOD_ENABLED:
+            self.flush_automod_log.start()
+
+    def cog_unload(self):
+        self.load_expirations.cancel()
+        self.flush_automod_log.cancel()
+        self.process_raid_queue.cancel()
+        self.expirations.stop()
+        for job in list(self.mute_jobs.values()) + list(self.ban_index_jobs.values()):
+            job.cancel()
 
-    def _ensure_timeout_file(self):
-        """Create the timeout roles file if it doesn't exist"""
-        if not os.path.exists(self.timeout_file):
-            with open(self.timeout_file, 'w') as f:
-                json.dump({}, f)
+    @tasks.loop(count=1)
+    async def load_expirations(self):
+        await timeout_store.loaded.wait()
+        for record in timeout_store.get_expiring():
+            self.schedule_expiry(record['guild_id'], record['user_id'], record['expires_at'])
+        self.expirations.start()
+        logger.info(f"⏰ {len(self.expirations)} timeout expirations scheduled")
+
+    @load_expirations.before_loop
+    async def before_load_expirations(self):
+        await self.bot.wait_until_ready()
+
+    def schedule_expiry(self, guild_id: str, user_id: str, expires_at: float):
+        self.expirations.schedule(
+            (guild_id, user_id), expires_at,
+            lambda: self.expire_timeout(guild_id, user_id)
+        )
+
+    def retry_expiry(self, guild_id: str, user_id: str, error):
+        self.schedule_expiry(guild_id, user_id, time.time() + Config.TIMEOUT_EXPIRY_RETRY)
+        logger.error(f"❌ Couldn't lift timeout of {user_id} in guild {guild_id}, retrying in {Config.TIMEOUT_EXPIRY_RETRY}s: {error}")
+
+    async def expire_timeout(self, guild_id: str, user_id: str):
+        """Restore a member's roles once their timeout runs out"""
+        user_data = timeout_store.get(guild_id, user_id)
+        if not user_data:
+            return
+
+        guild = self.bot.get_guild(int(guild_id))
+        if guild is None:
+            # The bot isn't in the server any more - nothing to give back
+            await timeout_store.remove(guild_id, user_id)
+            return
+        if guild.unavailable:
+            # Discord outage - keep the saved roles and try again later
+            self.retry_expiry(guild_id, user_id, f"guild {guild_id} is unavailable")
+            return
+
+        member = guild.get_member(int(user_id))
+        if member is None:
+            try:
+                member = await guild.fetch_member(int(user_id))
+            except discord.NotFound:
+                # Left the server - nothing to give back
+                await timeout_store.remove(guild_id, user_id)
+                return
+            except discord.HTTPException as e:
+                self.retry_expiry(guild_id, user_id, e)
+                return
 
-    def _load_timeout_data(self):
-        """Load timeout data from file"""
         try:
-            with open(self.timeout_file, 'r') as f:
-                return json.load(f)
+            restored, missing = await self.restore_timeout(member, user_data, reason="Timeout expired")
         except Exception as e:
-            logger.error(f"Error loading timeout data: {e}")
-            return {}
+            # The job was already popped, so without this the member would stay timed out until a restart
+            self.retry_expiry(guild_id, user_id, e)
+            return
+        logger.info(f"{member} timeout expired in {guild.name}. {restored} roles restored, {missing} missing.")
 
-    def _save_timeout_data(self, data):
-        """Save timeout data to file"""
         try:
-            with open(self.timeout_file, 'w') as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            logger.error(f"Error saving timeout data: {e}")
+            dm_embed = discord.Embed(
+                title="▶️ Timeout Expired",
+                description=f"Your timeout in **{guild.name}** has ended and your roles have been restored.",
+                color=0x2ECC71,
+                timestamp=datetime.now(timezone.utc)
+            )
+            await member.send(embed=dm_embed)
+        except:
+            pass  # User has DMs disabled
+
+    async def restore_timeout(self, member: discord.Member, user_data: dict, reason: str):
+        """Give back saved roles, drop the Timeout role and clear the record.
+
+        Returns (roles restored, roles that no longer exist). Raises discord.Forbidden.
+        """
+        guild = member.guild
+        timeout_role = discord.utils.get(guild.roles, name="Timeout")
+
+        roles_to_restore = []
+        missing_roles = 0
+        for role_id in user_data.get("roles", []):
+            role = guild.get_role(role_id)
+            if role:
+                roles_to_restore.append(role)
+            else:
+                missing_roles += 1
+
+        if timeout_role and timeout_role in member.roles:
+            await member.remove_roles(timeout_role, reason=reason)
+        if roles_to_restore:
+            await member.add_roles(*roles_to_restore, reason=reason)
+
+        await timeout_store.remove(str(guild.id), str(member.id))
+        self.expirations.cancel((str(guild.id), str(member.id)))
+        return len(roles_to_restore), missing_roles
+
+    def resolve_modmail_channel(self, guild: discord.Guild):
+        """Pick where forwarded DMs go in a guild"""
+        channels = {channel.name: channel for channel in guild.text_channels}
+        for name in ("mod-mail", "staff", "admin"):
+            if name in channels:
+                return channels[name]
+        return guild.system_channel or (guild.text_channels[0] if guild.text_channels else None)
+
+    def refresh_modmail_route(self, guild: discord.Guild):
+        channel = self.resolve_modmail_channel(guild)
+        if channel:
+            self.modmail_routes[guild.id] = channel.id
+        else:
+            self.modmail_routes.pop(guild.id, None)
+
+    def get_modmail_channel(self, guild: discord.Guild):
+        if guild.id not in self.modmail_routes:
+            self.refresh_modmail_route(guild)
+        channel_id = self.modmail_routes.get(guild.id)
+        return guild.get_channel(channel_id) if channel_id else None
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        self.modmail_routes.clear()
+        for guild in self.bot.guilds:
+            self.refresh_modmail_route(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        self.refresh_modmail_route(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.modmail_routes.pop(guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_update(self, before, after):
+        if before.system_channel != after.system_channel:
+            self.refresh_modmail_route(after)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        self.refresh_modmail_route(channel.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        self.refresh_modmail_route(channel.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        if before.name != after.name or before.position != after.position:
+            self.refresh_modmail_route(after.guild)
 
     @commands.Cog.listener()
     async def on_message(self, message):
@@ -53,18 +223,28 @@ class Moderation(commands.Cog):
                 embed.set_author(name=str(message.author), icon_url=message.author.display_avatar.url)
                 embed.set_footer(text=f"User ID: {message.author.id}")
                 
-                for guild in self.bot.guilds:
-                    target_channel = discord.utils.get(guild.text_channels, name="mod-mail") or \
-                                   discord.utils.get(guild.text_channels, name="staff") or \
-                                   discord.utils.get(guild.text_channels, name="admin") or \
-                                   guild.system_channel or \
-                                   guild.text_channels[0] if guild.text_channels else None
-                    
-                    if target_channel:
-                        await target_channel.send(embed=embed)
+                # Only servers the sender is actually in, sent concurrently
+                targets = [
+                    (guild, channel) for guild in message.author.mutual_guilds
+                    if (channel := self.get_modmail_channel(guild))
+                ]
+                results = await asyncio.gather(
+                    *(channel.send(embed=embed) for _, channel in targets),
+                    return_exceptions=True
+                )
+                
+                delivered = 0
+                for (guild, _), result in zip(targets, results):
+                    if isinstance(result, Exception):
+                        logger.warning(f"Could not forward DM from {message.author} to {guild.name}: {result}")
+                    else:
+                        delivered += 1
                         logger.info(f"DM from {message.author} forwarded to {guild.name}")
                 
-                await message.reply("✅ Your message has been sent to the server staff. They will respond soon!")
+                if delivered:
+                    await message.reply("✅ Your message has been sent to the server staff. They will respond soon!")
+                else:
+                    await message.reply("⚠️ There was an error forwarding your message. Please try again later.")
                 
             except Exception as e:
                 logger.error(f"Error handling DM from {message.author}: {e}", exc_info=True)
@@ -72,96 +252,435 @@ class Moderation(commands.Cog):
                     await message.reply("⚠️ There was an error forwarding your message. Please try again later.")
                 except:
                     pass
+        
+        elif Config.AUTOMOD_ENABLED and message.guild:
+            await self.run_automod(message)
+
+    # --- Automod ---
+    async def get_word_filter(self, guild_id: str):
+        """Compiled blocked-word pattern for a guild (None if it has no words)"""
+        # Settings are cached (and invalidated across instances), so this is normally a memory read;
+        # the pattern is rebuilt whenever the word list changes, wherever it was changed
+        words = await server_settings.get(guild_id, 'automod_words', [])
+        cached = self.word_filters.get(guild_id)
+        if cached is None or cached[0] != words:
+            cached = self.word_filters[guild_id] = (words, self.compile_word_filter(words))
+        return cached[1]
+
+    @staticmethod
+    def compile_word_filter(words):
+        if not words:
+            return None
+        # One alternation, longest words first, so each message is a single regex scan
+        alternatives = '|'.join(re.escape(word) for word in sorted(set(words), key=len, reverse=True))
+        return re.compile(rf'(?<!\w)(?:{alternatives})(?!\w)', re.IGNORECASE)
+
+    def check_spam(self, key: tuple, content: str, now: float):
+        """Sliding-window flood and duplicate checks; returns a violation name or None"""
+        recent = self.recent_messages.get(key)
+        if recent is None:
+            recent = self.recent_messages[key] = deque(maxlen=max(Config.AUTOMOD_SPAM_MESSAGES, Config.AUTOMOD_DUPLICATE_MESSAGES))
+        recent.append((now, hash(content.strip().lower())))
+
+        if len(recent) >= Config.AUTOMOD_SPAM_MESSAGES:
+            oldest = recent[-Config.AUTOMOD_SPAM_MESSAGES][0]
+            if now - oldest < Config.AUTOMOD_SPAM_WINDOW:
+                return 'spam'
+
+        if content and len(recent) >= Config.AUTOMOD_DUPLICATE_MESSAGES:
+            window = list(recent)[-Config.AUTOMOD_DUPLICATE_MESSAGES:]
+            if now - window[0][0] < Config.AUTOMOD_DUPLICATE_WINDOW and len({digest for _, digest in window}) == 1:
+                return 'duplicate'
+
+        return None
+
+    async def run_automod(self, message):
+        member = message.author
+        if not isinstance(member, discord.Member) or member.guild_permissions.manage_messages:
+            return
+
+        guild_id = str(message.guild.id)
+        now = message.created_at.timestamp()
+        violation = self.check_spam((message.guild.id, member.id), message.content, now)
+
+        if violation is None:
+            word_filter = await self.get_word_filter(guild_id)
+            if word_filter and word_filter.search(message.content):
+                violation = 'blocked word'
+
+        if violation is None:
+            return
+
+        try:
+            await message.delete()
+            if violation == 'spam':
+                await member.timeout_for(timedelta(minutes=Config.AUTOMOD_SPAM_TIMEOUT), reason="Automod: spam")
+        except discord.HTTPException as e:
+            logger.warning(f"Automod could not act on {member} in {message.guild.name}: {e}")
+
+        self.automod_events.append((message.guild, member, message.channel, violation, message.content))
+
+    @tasks.loop(seconds=Config.AUTOMOD_LOG_INTERVAL)
+    async def flush_automod_log(self):
+        # Forget users whose last message is older than every window
+        cutoff = datetime.now(timezone.utc).timestamp() - max(Config.AUTOMOD_SPAM_WINDOW, Config.AUTOMOD_DUPLICATE_WINDOW)
+        for key in [k for k, recent in self.recent_messages.items() if recent[-1][0] < cutoff]:
+            del self.recent_messages[key]
+
+        if not self.automod_events:
+            return
+
+        events, self.automod_events = self.automod_events, []
+        channel = self.bot.get_channel(int(Config.AUTOMOD_LOG_CHANNEL)) if Config.AUTOMOD_LOG_CHANNEL else None
+        if not channel:
+            return
+
+        embeds = []
+        for guild, member, source, violation, content in events:
+            embed = discord.Embed(
+                title=f"🛡️ Automod: {violation}",
+                description=content[:1000] or "*no text*",
+                color=0xE74C3C,
+                timestamp=datetime.now(timezone.utc)
+            )
+            embed.add_field(name="User", value=f"{member.mention} ({member.id})", inline=True)
+            embed.add_field(name="Channel", value=source.mention, inline=True)
+            embed.set_footer(text=guild.name)
+            embeds.append(embed)
+
+        # Up to 10 embeds per message
+        for i in range(0, len(embeds), 10):
+            try:
+                await channel.send(embeds=embeds[i:i + 10])
+            except discord.HTTPException as e:
+                logger.error(f"Could not post automod log: {e}")
+                break
+
+    @flush_automod_log.before_loop
+    async def before_flush_automod_log(self):
+        await self.bot.wait_until_ready()
+
+    @discord.slash_command(name='automodword', description='Manage the automod blocked word list (Admin only)')
+    @option("action", description="What to do", choices=["add", "remove", "list"])
+    @option("word", description="Word or phrase", required=False)
+    @discord.default_permissions(administrator=True)
+    async def automodword(self, ctx, action: str, word: str = None):
+        guild_id = str(ctx.guild.id)
+        words = await server_settings.get(guild_id, 'automod_words', [])
+
+        if action == 'list':
+            listed = ', '.join(f'`{w}`' for w in words) if words else 'No blocked words yet.'
+            await ctx.respond(f"🛡️ Blocked words: {listed}", ephemeral=True)
+            return
+
+        if not word:
+            await ctx.respond("❌ Please provide a word.", ephemeral=True)
+            return
+
+        word = word.strip().lower()
+        if action == 'add':
+            if word in words:
+                await ctx.respond(f"❌ `{word}` is already blocked.", ephemeral=True)
+                return
+            words = words + [word]
+        else:
+            if word not in words:
+                await ctx.respond(f"❌ `{word}` is not on the list.", ephemeral=True)
+                return
+            words = [w for w in words if w != word]
+
+        await server_settings.set(guild_id, 'automod_words', words)
+        await ctx.respond(f"✅ {'Added' if action == 'add' else 'Removed'} `{word}` ({len(words)} blocked words)", ephemeral=True)
+
+    # --- Raid protection ---
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        action = await server_settings.get(str(member.guild.id), 'raid_action', 'off')
+        if action == 'off':
+            return
+
+        guild = member.guild
+        now = datetime.now(timezone.utc)
+        counter = self.join_rates.get(guild.id)
+        if counter is None:
+            counter = self.join_rates[guild.id] = SlidingWindowCounter(Config.RAID_JOIN_WINDOW)
+        recent = self.recent_joins.get(guild.id)
+        if recent is None:
+            recent = self.recent_joins[guild.id] = deque(maxlen=Config.RAID_RECENT_JOINS)
+
+        suspicious = self.is_suspicious_join(member, recent, now)
+        recent.append((member.id, member.name.lower(), suspicious))
+
+        rate = counter.hit(now.timestamp())
+        raid_until = self.raid_mode.get(guild.id, 0)
+
+        if rate >= Config.RAID_JOIN_THRESHOLD and raid_until <= now.timestamp():
+            # Raid starts: also sweep up the suspicious accounts that joined just before it tripped
+            self.raid_mode[guild.id] = now.timestamp() + Config.RAID_MODE_DURATION
+            logger.warning(f"🚨 Raid detected in {guild.name}: ~{rate:.0f} joins in {Config.RAID_JOIN_WINDOW}s")
+            for user_id, _, flagged in recent:
+                if flagged and user_id != member.id:
+                    self.raid_queue.put_nowait((guild.id, user_id, action))
+            await self.alert_raid(guild, rate, action)
+        elif raid_until > now.timestamp():
+            self.raid_mode[guild.id] = now.timestamp() + Config.RAID_MODE_DURATION
+        else:
+            return
+
+        if suspicious:
+            self.raid_queue.put_nowait((guild.id, member.id, action))
+
+    def is_suspicious_join(self, member, recent, now: datetime) -> bool:
+        """Young account, or a name that closely matches other recent joiners"""
+        if (now - member.created_at).days < Config.RAID_MIN_ACCOUNT_AGE:
+            return True
+
+        name = member.name.lower()
+        similar = sum(
+            1 for _, other, _ in recent
+            if SequenceMatcher(None, name, other).ratio() >= Config.RAID_NAME_SIMILARITY
+        )
+        return similar >= Config.RAID_SIMILAR_NAMES
+
+    async def alert_raid(self, guild, rate: float, action: str):
+        channel = self.get_modmail_channel(guild)
+        if not channel:
+            return
+        try:
+            await channel.send(
+                f"🚨 **Possible raid** - about {rate:.0f} joins in {Config.RAID_JOIN_WINDOW}s. "
+                f"Suspicious new accounts will be handled with **{action}** for the next "
+                f"{Config.RAID_MODE_DURATION // 60} minutes. Use `/antiraid off` to stop."
+            )
+        except discord.HTTPException:
+            pass
+
+    @tasks.loop()
+    async def process_raid_queue(self):
+        guild_id, user_id, action = await self.raid_queue.get()
+        guild = self.bot.get_guild(guild_id)
+        member = guild.get_member(user_id) if guild else None
+        if member:
+            reason = "Anti-raid: suspicious account during join spike"
+            try:
+                if action == 'timeout':
+                    await member.timeout_for(timedelta(minutes=Config.RAID_TIMEOUT), reason=reason)
+                elif action == 'kick':
+                    await member.kick(reason=reason)
+                elif action == 'ban':
+                    await member.ban(reason=reason, delete_message_seconds=86400)
+                logger.info(f"Anti-raid {action}: {member} in {guild.name}")
+            except discord.HTTPException as e:
+                logger.warning(f"Anti-raid could not {action} {member} in {guild.name}: {e}")
+        # Pace the bulk actions well under the API limits
+        await asyncio.sleep(1 / Config.RAID_ACTIONS_PER_SECOND)
+
+    @process_raid_queue.before_loop
+    async def before_process_raid_queue(self):
+        await self.bot.wait_until_ready()
+
+    @discord.slash_command(name='antiraid', description='Configure join-raid protection (Admin only)')
+    @option("action", description="What to do with suspicious accounts during a raid", choices=["off", "timeout", "kick", "ban"])
+    @discord.default_permissions(administrator=True)
+    async def antiraid(self, ctx, action: str):
+        await server_settings.set(str(ctx.guild.id), 'raid_action', action)
+        if action == 'off':
+            self.raid_mode.pop(ctx.guild.id, None)
+            await ctx.respond("🛡️ Raid protection disabled.")
+        else:
+            await ctx.respond(
+                f"🛡️ Raid protection enabled: {Config.RAID_JOIN_THRESHOLD}+ joins within "
+                f"{Config.RAID_JOIN_WINDOW}s will **{action}** suspicious accounts."
+            )
+
+    async def apply_timeout(self, member: discord.Member, moderator, reason: str, duration: int):
+        """Swap a member's roles for the Timeout role, saving them for later.
+
+        Returns the stored timeout record, or None if the member is already timed out.
+        Raises discord.Forbidden (after discarding the record) if the roles can't be changed.
+        """
+        guild = member.guild
+        guild_id = str(guild.id)
+        user_id = str(member.id)
+        
+        if timeout_store.get(guild_id, user_id):
+            return None
+
+        # Get or create the Timeout role
+        timeout_role = discord.utils.get(guild.roles, name="Timeout")
+        if not timeout_role:
+            timeout_role = await guild.create_role(
+                name="Timeout",
+                color=discord.Color.orange(),
+                reason="Timeout role created by moderation system"
+            )
+            logger.info(f"Created Timeout role in {guild.name}")
+
+        # Save user's current roles (excluding @everyone and managed roles)
+        saved_roles = []
+        roles_to_remove = []
+        
+        for role in member.roles:
+            if role.name != "@everyone" and not role.managed and role.id != timeout_role.id:
+                saved_roles.append(role.id)
+                roles_to_remove.append(role)
+
+        now = datetime.now(timezone.utc)
+        expires_at = now.timestamp() + duration * 60 if duration else None
+        record = {
+            "roles": saved_roles,
+            "reason": reason,
+            "timed_out_by": moderator.id,
+            "timestamp": now.isoformat(),
+            "expires_at": expires_at
+        }
+
+        # Save the roles (the unique index rejects a concurrent second timeout)
+        if not await timeout_store.add(guild_id, user_id, record):
+            return None
+
+        # Remove roles and add timeout role
+        try:
+            await member.remove_roles(*roles_to_remove, reason=f"Timeout by {moderator}: {reason}")
+            await member.add_roles(timeout_role, reason=f"Timeout by {moderator}: {reason}")
+        except discord.Forbidden:
+            # Remove from timeout data since we couldn't complete the action
+            await timeout_store.remove(guild_id, user_id)
+            raise
+
+        if expires_at:
+            self.schedule_expiry(guild_id, user_id, expires_at)
+        logger.info(f"{member} timed out by {moderator} in {guild.name}. {len(saved_roles)} roles saved.")
+        
+        # Try to notify the user
+        try:
+            dm_embed = discord.Embed(
+                title="⏸️ You've Been Timed Out",
+                description=f"You have been placed in timeout in **{guild.name}**.",
+                color=0xFF8C00,
+                timestamp=datetime.now(timezone.utc)
+            )
+            dm_embed.add_field(name="Reason", value=reason, inline=False)
+            dm_embed.add_field(name="What this means", value="Your roles have been temporarily removed. You can access timeout forums. Contact staff if you have questions.", inline=False)
+            await member.send(embed=dm_embed)
+        except:
+            pass  # User has DMs disabled
+        
+        return record
 
     @discord.slash_command(name='timeout', description='Timeout a member by removing their roles (Admin only)')
     @option("user", discord.Member, description="Member to timeout")
     @option("reason", description="Reason for timeout", required=False)
+    @option("duration", int, description="Minutes until roles are restored automatically (0 = until /untimeout)", required=False, min_value=0)
     @discord.default_permissions(administrator=True)
-    async def timeout(self, ctx, user: discord.Member, reason: str = "No reason provided"):
+    async def timeout(self, ctx, user: discord.Member, reason: str = "No reason provided", duration: int = Config.TIMEOUT_DURATION):
         await ctx.defer()
         
         try:
-            # Check if user is already timed out
-            timeout_data = self._load_timeout_data()
-            user_key = f"{ctx.guild.id}_{user.id}"
+            try:
+                record = await self.apply_timeout(user, ctx.author, reason, duration)
+            except discord.Forbidden:
+                await ctx.followup.send(f"❌ I don't have permission to modify {user.mention}'s roles.")
+                return
             
-            if user_key in timeout_data:
+            if record is None:
                 await ctx.followup.send(f"❌ {user.mention} is already timed out.")
                 return
-
-            # Get or create the Timeout role
-            timeout_role = discord.utils.get(ctx.guild.roles, name="Timeout")
-            if not timeout_role:
-                timeout_role = await ctx.guild.create_role(
-                    name="Timeout",
-                    color=discord.Color.orange(),
-                    reason="Timeout role created by moderation system"
-                )
-                logger.info(f"Created Timeout role in {ctx.guild.name}")
-
-            # Save user's current roles (excluding @everyone and managed roles)
-            saved_roles = []
-            roles_to_remove = []
             
-            for role in user.roles:
-                if role.name != "@everyone" and not role.managed and role.id != timeout_role.id:
-                    saved_roles.append(role.id)
-                    roles_to_remove.append(role)
-
-            # Save to file
-            timeout_data[user_key] = {
-                "user_id": user.id,
-                "guild_id": ctx.guild.id,
-                "roles": saved_roles,
-                "reason": reason,
-                "timed_out_by": ctx.author.id,
-                "timestamp": datetime.now(timezone.utc).isoformat()
-            }
-            self._save_timeout_data(timeout_data)
-
-            # Remove roles and add timeout role
-            try:
-                await user.remove_roles(*roles_to_remove, reason=f"Timeout by {ctx.author}: {reason}")
-                await user.add_roles(timeout_role, reason=f"Timeout by {ctx.author}: {reason}")
-                
-                embed = discord.Embed(
-                    title="⏸️ User Timed Out",
-                    description=f"{user.mention} has been placed in timeout.",
-                    color=0xFF8C00,
-                    timestamp=datetime.now(timezone.utc)
-                )
-                embed.add_field(name="Reason", value=reason, inline=False)
-                embed.add_field(name="Moderator", value=ctx.author.mention, inline=True)
-                embed.add_field(name="Roles Saved", value=str(len(saved_roles)), inline=True)
-                embed.set_footer(text=f"User ID: {user.id}")
-                
-                await ctx.followup.send(embed=embed)
-                logger.info(f"{user} timed out by {ctx.author} in {ctx.guild.name}. {len(saved_roles)} roles saved.")
-                
-                # Try to notify the user
-                try:
-                    dm_embed = discord.Embed(
-                        title="⏸️ You've Been Timed Out",
-                        description=f"You have been placed in timeout in **{ctx.guild.name}**.",
-                        color=0xFF8C00,
-                        timestamp=datetime.now(timezone.utc)
-                    )
-                    dm_embed.add_field(name="Reason", value=reason, inline=False)
-                    dm_embed.add_field(name="What this means", value="Your roles have been temporarily removed. You can access timeout forums. Contact staff if you have questions.", inline=False)
-                    await user.send(embed=dm_embed)
-                except:
-                    pass  # User has DMs disabled
-                
-            except discord.Forbidden:
-                await ctx.followup.send(f"❌ I don't have permission to modify {user.mention}'s roles.")
-                # Remove from timeout data since we couldn't complete the action
-                del timeout_data[user_key]
-                self._save_timeout_data(timeout_data)
+            expires_at = record["expires_at"]
+            embed = discord.Embed(
+                title="⏸️ User Timed Out",
+                description=f"{user.mention} has been placed in timeout.",
+                color=0xFF8C00,
+                timestamp=datetime.now(timezone.utc)
+            )
+            embed.add_field(name="Reason", value=reason, inline=False)
+            embed.add_field(name="Moderator", value=ctx.author.mention, inline=True)
+            embed.add_field(name="Roles Saved", value=str(len(record["roles"])), inline=True)
+            embed.add_field(name="Ends", value=f"<t:{int(expires_at)}:R>" if expires_at else "Until /untimeout", inline=True)
+            embed.set_footer(text=f"User ID: {user.id}")
+            
+            await ctx.followup.send(embed=embed)
                 
         except Exception as e:
             await ctx.followup.send(f"⚠️ An error occurred: {str(e)}")
             logger.error(f"Error timing out {user}: {e}", exc_info=True)
 
+    @discord.slash_command(name='warn', description='Warn a member (Admin only)')
+    @option("user", discord.Member, description="Member to warn")
+    @option("reason", description="Reason for the warning", required=False)
+    @discord.default_permissions(administrator=True)
+    async def warn(self, ctx, user: discord.Member, reason: str = "No reason provided"):
+        await ctx.defer()
+        guild_id = str(ctx.guild.id)
+        
+        count = await bot_data.add_warning(guild_id, str(user.id), reason, str(ctx.author.id))
+        
+        embed = discord.Embed(
+            title="⚠️ User Warned",
+            description=f"{user.mention} has been warned.",
+            color=0xF1C40F,
+            timestamp=datetime.now(timezone.utc)
+        )
+        embed.add_field(name="Reason", value=reason, inline=False)
+        embed.add_field(name="Moderator", value=ctx.author.mention, inline=True)
+        embed.add_field(name="Warnings", value=f"{count}/{Config.WARN_THRESHOLD}", inline=True)
+        
+        # The counter comes back from the same atomic update, so only one warn can land exactly on the threshold
+        if count == Config.WARN_THRESHOLD:
+            try:
+                record = await self.apply_timeout(
+                    user, ctx.guild.me, f"Reached {Config.WARN_THRESHOLD} warnings", Config.TIMEOUT_DURATION
+                )
+                if record:
+                    embed.add_field(name="⏸️ Auto Timeout", value=f"Timed out for {Config.TIMEOUT_DURATION} minutes.", inline=False)
+            except discord.Forbidden:
+                embed.add_field(name="⏸️ Auto Timeout", value="Threshold reached, but I couldn't change their roles.", inline=False)
+        
+        await ctx.followup.send(embed=embed)
+        logger.info(f"{user} warned by {ctx.author} in {ctx.guild.name} ({count} warnings)")
+        
+        try:
+            await user.send(f"⚠️ You were warned in **{ctx.guild.name}**: {reason}")
+        except:
+            pass  # User has DMs disabled
+
+    @discord.slash_command(name='warnings', description='View a member\'s warnings (Admin only)')
+    @option("user", discord.Member, description="Member to check")
+    @discord.default_permissions(administrator=True)
+    async def warnings(self, ctx, user: discord.Member):
+        warnings = await bot_data.get_warnings(str(ctx.guild.id), str(user.id), limit=10)
+        total = await bot_data.count_warnings(str(ctx.guild.id), str(user.id))
+        
+        if not warnings:
+            await ctx.respond(f"✅ {user.mention} has no warnings.")
+            return
+        
+        embed = discord.Embed(
+            title=f"⚠️ Warnings for {user.display_name}",
+            description=f"Total: {total}",
+            color=0xF1C40F
+        )
+        for warning in warnings:
+            moderator = ctx.guild.get_member(int(warning["moderator_id"]))
+            mod_name = moderator.mention if moderator else "Unknown"
+            embed.add_field(
+                name=datetime.fromtimestamp(warning["timestamp"], timezone.utc).strftime("%Y-%m-%d %H:%M UTC"),
+                value=f"**Reason:** {warning['reason']}\n**By:** {mod_name}",
+                inline=False
+            )
+        if total > len(warnings):
+            embed.set_footer(text=f"Showing the latest {len(warnings)} of {total}")
+        
+        await ctx.respond(embed=embed)
+
+    @discord.slash_command(name='clearwarnings', description='Clear a member\'s warnings (Admin only)')
+    @option("user", discord.Member, description="Member to clear")
+    @discord.default_permissions(administrator=True)
+    async def clearwarnings(self, ctx, user: discord.Member):
+        await bot_data.clear_warnings(str(ctx.guild.id), str(user.id))
+        await ctx.respond(f"✅ Cleared all warnings for {user.mention}.")
+
     @discord.slash_command(name='untimeout', description='Remove timeout and restore roles (Admin only)')
     @option("user", discord.Member, description="Member to untimeout")
     @discord.default_permissions(administrator=True)
@@ -169,41 +688,19 @@ class Moderation(commands.Cog):
         await ctx.defer()
         
         try:
-            timeout_data = self._load_timeout_data()
-            user_key = f"{ctx.guild.id}_{user.id}"
+            guild_id = str(ctx.guild.id)
+            user_id = str(user.id)
+            user_data = timeout_store.get(guild_id, user_id)
             
-            if user_key not in timeout_data:
+            if not user_data:
                 await ctx.followup.send(f"❌ {user.mention} is not currently timed out.")
                 return
 
-            user_data = timeout_data[user_key]
-            saved_role_ids = user_data.get("roles", [])
-            
-            # Get the timeout role
-            timeout_role = discord.utils.get(ctx.guild.roles, name="Timeout")
-            
-            # Get the role objects
-            roles_to_restore = []
-            missing_roles = []
-            
-            for role_id in saved_role_ids:
-                role = ctx.guild.get_role(role_id)
-                if role:
-                    roles_to_restore.append(role)
-                else:
-                    missing_roles.append(role_id)
-
             # Restore roles and remove timeout role
             try:
-                if timeout_role and timeout_role in user.roles:
-                    await user.remove_roles(timeout_role, reason=f"Untimeout by {ctx.author}")
-                
-                if roles_to_restore:
-                    await user.add_roles(*roles_to_restore, reason=f"Untimeout by {ctx.author}")
-                
-                # Remove from timeout data
-                del timeout_data[user_key]
-                self._save_timeout_data(timeout_data)
+                roles_restored, missing_roles = await self.restore_timeout(
+                    user, user_data, reason=f"Untimeout by {ctx.author}"
+                )
                 
                 embed = discord.Embed(
                     title="▶️ User Untimeout",
@@ -212,15 +709,15 @@ class Moderation(commands.Cog):
                     timestamp=datetime.now(timezone.utc)
                 )
                 embed.add_field(name="Moderator", value=ctx.author.mention, inline=True)
-                embed.add_field(name="Roles Restored", value=str(len(roles_to_restore)), inline=True)
+                embed.add_field(name="Roles Restored", value=str(roles_restored), inline=True)
                 
                 if missing_roles:
-                    embed.add_field(name="⚠️ Missing Roles", value=f"{len(missing_roles)} role(s) no longer exist and couldn't be restored.", inline=False)
+                    embed.add_field(name="⚠️ Missing Roles", value=f"{missing_roles} role(s) no longer exist and couldn't be restored.", inline=False)
                 
                 embed.set_footer(text=f"User ID: {user.id}")
                 
                 await ctx.followup.send(embed=embed)
-                logger.info(f"{user} untimed out by {ctx.author} in {ctx.guild.name}. {len(roles_to_restore)} roles restored.")
+                logger.info(f"{user} untimed out by {ctx.author} in {ctx.guild.name}. {roles_restored} roles restored.")
                 
                 # Try to notify the user
                 try:
@@ -247,8 +744,7 @@ class Moderation(commands.Cog):
         await ctx.defer()
         
         try:
-            timeout_data = self._load_timeout_data()
-            guild_timeouts = [data for key, data in timeout_data.items() if data.get("guild_id") == ctx.guild.id]
+            guild_timeouts = timeout_store.get_guild(str(ctx.guild.id))
             
             if not guild_timeouts:
                 await ctx.followup.send("✅ No users are currently timed out.")
@@ -262,7 +758,7 @@ class Moderation(commands.Cog):
             )
             
             for data in guild_timeouts[:10]:  # Limit to 10 to avoid embed limits
-                user = ctx.guild.get_member(data["user_id"])
+                user = ctx.guild.get_member(int(data["user_id"]))
                 user_name = user.mention if user else f"<@{data['user_id']}>"
                 
                 moderator = ctx.guild.get_member(data.get("timed_out_by", 0))
@@ -271,10 +767,11 @@ class Moderation(commands.Cog):
                 timestamp = data.get("timestamp", "Unknown")
                 reason = data.get("reason", "No reason provided")
                 roles_count = len(data.get("roles", []))
+                ends = f"<t:{int(data['expires_at'])}:R>" if data.get("expires_at") else "Until /untimeout"
                 
                 embed.add_field(
                     name=f"{user_name}",
-                    value=f"**Reason:** {reason}\n**By:** {mod_name}\n**Roles Saved:** {roles_count}\n**Date:** <t:{int(datetime.fromisoformat(timestamp).timestamp())}:R>",
+                    value=f"**Reason:** {reason}\n**By:** {mod_name}\n**Roles Saved:** {roles_count}\n**Date:** <t:{int(datetime.fromisoformat(timestamp).timestamp())}:R>\n**Ends:** {ends}",
                     inline=False
                 )
             
@@ -287,16 +784,88 @@ class Moderation(commands.Cog):
             await ctx.followup.send(f"⚠️ An error occurred: {str(e)}")
             logger.error(f"Error viewing timeouts: {e}", exc_info=True)
 
+    def start_mute_setup(self, role: discord.Role, report_channel=None):
+        """Apply the Muted overwrites in the background (one job per guild)"""
+        job = self.mute_jobs.get(role.guild.id)
+        if job and not job.done():
+            return
+
+        # Only channels whose overwrite doesn't already deny both permissions need an API call
+        failed = self.mute_setup_failed.get(role.id, set())
+        pending = []
+        for channel in role.guild.channels:
+            if channel.id in failed:
+                continue
+            overwrite = channel.overwrites_for(role)
+            if overwrite.send_messages is False and overwrite.speak is False:
+                continue
+            pending.append((channel, overwrite))
+
+        if pending:
+            self.mute_jobs[role.guild.id] = asyncio.create_task(
+                self.propagate_mute_permissions(role, pending, report_channel)
+            )
+
+    async def propagate_mute_permissions(self, role: discord.Role, pending: list, report_channel=None):
+        guild = role.guild
+        semaphore = asyncio.Semaphore(Config.MUTE_SETUP_CONCURRENCY)
+        done = 0
+        failed = 0
+        progress_message = None
+        last_report = 0.0
+
+        if report_channel:
+            try:
+                progress_message = await report_channel.send(f"🔧 Setting up the Muted role in {len(pending)} channels...")
+            except discord.HTTPException:
+                pass
+
+        async def apply(channel, overwrite):
+            nonlocal done, failed, last_report
+            # Keep whatever the overwrite already allows/denies and only add the mute denies
+            overwrite.update(send_messages=False, speak=False)
+            async with semaphore:
+                try:
+                    await channel.set_permissions(role, overwrite=overwrite, reason="Muted role setup")
+                except discord.HTTPException as e:
+                    failed += 1
+                    self.mute_setup_failed.setdefault(role.id, set()).add(channel.id)
+                    logger.warning(f"Could not set Muted permissions in #{channel} ({guild.name}): {e}")
+            done += 1
+
+            now = asyncio.get_running_loop().time()
+            if progress_message and now - last_report >= Config.MUTE_SETUP_PROGRESS_INTERVAL:
+                last_report = now
+                try:
+                    await progress_message.edit(content=f"🔧 Setting up the Muted role... {done}/{len(pending)} channels")
+                except discord.HTTPException:
+                    pass
+
+        await asyncio.gather(*(apply(channel, overwrite) for channel, overwrite in pending))
+
+        summary = f"✅ Muted role set up in {done - failed}/{len(pending)} channels"
+        if failed:
+            summary += f" ({failed} failed - check my permissions)"
+        if progress_message:
+            try:
+                await progress_message.edit(content=summary)
+            except discord.HTTPException:
+                pass
+        logger.info(f"Muted role setup in {guild.name}: {done - failed} channels updated, {failed} failed")
+
     @discord.slash_command(name='mute', description='Mute a member (Admin only)')
     @option("user", discord.Member, description="Member to mute")
     @option("reason", description="Reason for mute", required=False)
     @discord.default_permissions(administrator=True)
     async def mute(self, ctx, user: discord.Member, reason: str = "No reason provided"):
         role = discord.utils.get(ctx.guild.roles, name="Muted")
-        if not role:
+        created = role is None
+        if created:
             role = await ctx.guild.create_role(name="Muted")
-            for channel in ctx.guild.channels:
-                await channel.set_permissions(role, send_messages=False, speak=False)
+
+        # Channel overwrites are filled in (or topped up for new channels) in the background;
+        # progress is only posted for the first setup
+        self.start_mute_setup(role, ctx.channel if created else None)
 
         await user.add_roles(role, reason=reason)
         await ctx.respond(f"🔇 {user.mention} has been muted. Reason: {reason}")
@@ -328,21 +897,80 @@ class Moderation(commands.Cog):
         await user.ban(reason=reason)
         await ctx.respond(f"🔨 {user.mention} has been banned. Reason: {reason}")
 
+    # --- Ban index (backs /unban autocomplete) ---
+    def start_ban_index(self, guild: discord.Guild):
+        """Stream a guild's ban list into memory once; gateway events keep it current afterwards"""
+        job = self.ban_index_jobs.get(guild.id)
+        if guild.id in self.ban_index or (job and not job.done()):
+            return
+        self.ban_index_jobs[guild.id] = asyncio.create_task(self.load_ban_index(guild))
+
+    async def load_ban_index(self, guild: discord.Guild):
+        bans = {}
+        try:
+            async for entry in guild.bans(limit=None):
+                bans[entry.user.id] = str(entry.user)
+        except discord.HTTPException as e:
+            logger.warning(f"Could not load bans for {guild.name}: {e}")
+            return
+        self.ban_index[guild.id] = bans
+        logger.info(f"Indexed {len(bans)} bans in {guild.name}")
+
+    def search_bans(self, guild: discord.Guild, query: str, limit: int = 25):
+        self.start_ban_index(guild)
+        query = query.lower()
+        matches = []
+        for user_id, label in self.ban_index.get(guild.id, {}).items():
+            if query in label.lower() or query in str(user_id):
+                matches.append(discord.OptionChoice(name=f"{label} ({user_id})", value=str(user_id)))
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    @commands.Cog.listener()
+    async def on_member_ban(self, guild, user):
+        if guild.id in self.ban_index:
+            self.ban_index[guild.id][user.id] = str(user)
+
+    @commands.Cog.listener()
+    async def on_member_unban(self, guild, user):
+        if guild.id in self.ban_index:
+            self.ban_index[guild.id].pop(user.id, None)
+
+    async def find_ban(self, guild: discord.Guild, query: str):
+        """Resolve a banned user by ID (one request) or by name (streamed, stopping at the first match)"""
+        if query.isdigit():
+            try:
+                return (await guild.fetch_ban(discord.Object(id=int(query)))).user
+            except discord.NotFound:
+                return None
+
+        query = query.lower()
+        indexed = self.ban_index.get(guild.id)
+        if indexed is not None:
+            for user_id, label in indexed.items():
+                if label.lower() == query:
+                    return await self.bot.get_or_fetch_user(user_id)
+            return None
+
+        async for entry in guild.bans(limit=None):
+            if str(entry.user).lower() == query or entry.user.name.lower() == query:
+                return entry.user
+        return None
+
     @discord.slash_command(name='unban', description='Unban a member (Admin only)')
-    @option("username", description="Username#1234 of the user to unban")
+    @option("user", description="User ID or username of the banned user", autocomplete=banned_user_autocomplete)
     @discord.default_permissions(administrator=True)
-    async def unban(self, ctx, username: str):
-        banned_users = await ctx.guild.bans()
-        name, discriminator = username.split('#')
-
-        for ban_entry in banned_users:
-            user = ban_entry.user
-            if (user.name, user.discriminator) == (name, discriminator):
-                await ctx.guild.unban(user)
-                await ctx.respond(f"✅ Unbanned {user.mention}")
-                return
+    async def unban(self, ctx, user: str):
+        await ctx.defer()
+        banned_user = await self.find_ban(ctx.guild, user.strip())
+
+        if not banned_user:
+            await ctx.followup.send("❌ User not found in ban list.")
+            return
 
-        await ctx.respond("❌ User not found in ban list.")
+        await ctx.guild.unban(banned_user)
+        await ctx.followup.send(f"✅ Unbanned {banned_user.mention}")
 
     @discord.slash_command(name='dm', description='Send a direct message to a user (Admin only)')
     @option("user", discord.Member, description="User to DM")
@@ -19,7 +19,7 @@ class Reactions(commands.Cog):
 
         guild_id = str(payload.guild_id)
         emoji_str = str(payload.emoji)
-        role_id = reaction_roles.get_role_for_reaction(guild_id, str(payload.message_id), emoji_str)
+        role_id = await reaction_roles.get_role_for_reaction(guild_id, str(payload.message_id), emoji_str)
 
         if not role_id:
             return
@@ -52,7 +52,7 @@ class Reactions(commands.Cog):
 
         guild_id = str(payload.guild_id)
         emoji_str = str(payload.emoji)
-        role_id = reaction_roles.get_role_for_reaction(guild_id, str(payload.message_id), emoji_str)
+        role_id = await reaction_roles.get_role_for_reaction(guild_id, str(payload.message_id), emoji_str)
 
         if not role_id:
             return
@@ -100,7 +100,7 @@ class Reactions(commands.Cog):
             await ctx.respond('❌ Invalid emoji or unable to add reaction!', ephemeral=True)
             return
 
-        reaction_roles.add_reaction_role(guild_id, message_id, emoji, str(role.id))
+        await reaction_roles.add_reaction_role(guild_id, message_id, emoji, str(role.id))
 
         embed = discord.Embed(
             title='✅ Reaction Role Created',
@@ -120,26 +120,27 @@ class Reactions(commands.Cog):
     @discord.default_permissions(administrator=True)
     async def removereactionrole(self, ctx, message_id: str, emoji: str = None):
         guild_id = str(ctx.guild.id)
+        guild_reactions = await reaction_roles.get_guild_reaction_roles(guild_id)
 
-        if guild_id not in reaction_roles.data or message_id not in reaction_roles.data.get(guild_id, {}):
+        if message_id not in guild_reactions:
             await ctx.respond('❌ No reaction roles found for that message!', ephemeral=True)
             return
 
         if emoji:
-            if emoji not in reaction_roles.data[guild_id][message_id]:
+            if emoji not in guild_reactions[message_id]:
                 await ctx.respond('❌ That emoji is not set up for reaction roles!', ephemeral=True)
                 return
 
-            reaction_roles.remove_reaction_role(guild_id, message_id, emoji)
+            await reaction_roles.remove_reaction_role(guild_id, message_id, emoji)
             await ctx.respond(f'✅ Removed reaction role for {emoji}')
         else:
-            reaction_roles.remove_reaction_role(guild_id, message_id)
+            await reaction_roles.remove_reaction_role(guild_id, message_id)
             await ctx.respond(f'✅ Removed all reaction roles from message {message_id}')
 
     @discord.slash_command(name='listreactionroles', description='List all reaction roles')
     async def listreactionroles(self, ctx):
         guild_id = str(ctx.guild.id)
-        guild_reactions = reaction_roles.data.get(guild_id, {})
+        guild_reactions = await reaction_roles.get_guild_reaction_roles(guild_id)
 
         if not guild_reactions:
             await ctx.respond('No reaction roles configured yet!')
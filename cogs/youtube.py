@@ -1,32 +1,87 @@
 import discord
 from discord.ext import commands, tasks
+from discord import option
 from datetime import datetime
+from collections import deque
 import asyncio
-import feedparser
 import os
+import random
+import re
+import time
 import logging
 from utils.database import bot_data, server_settings
+from utils.feeds import FeedFetcher, parse_feed
+from utils.scheduler import Scheduler
+from utils.websub import WebSubClient
 from utils.config import Config
 
 logger = logging.getLogger('tooly_bot.youtube')
 
+YOUTUBE_CHANNEL_ID = re.compile(r'^UC[\w-]{22}$')
+FEED_URL = 'https://www.youtube.com/feeds/videos.xml?channel_id={}'
+
+
+class FeedState:
+    """Upload history for one YouTube channel, used to pick its polling interval"""
+
+    __slots__ = ('primed', 'last_upload', 'avg_gap')
+
+    def __init__(self):
+        self.primed = False  # history loaded from a full feed read
+        self.last_upload = None
+        self.avg_gap = None  # moving average of seconds between uploads
+
+    def record_uploads(self, published: list):
+        for timestamp in sorted(published):
+            if self.last_upload is not None and timestamp > self.last_upload:
+                gap = timestamp - self.last_upload
+                self.avg_gap = gap if self.avg_gap is None else 0.7 * self.avg_gap + 0.3 * gap
+            if self.last_upload is None or timestamp > self.last_upload:
+                self.last_upload = timestamp
+
+
 class YouTube(commands.Cog):
     """YouTube notification system"""
     
     def __init__(self, bot):
         self.bot = bot
-        self.check_videos.start()
+        self.legacy_seeded = False
+        self.feeds = FeedFetcher()
+        # One job per followed YouTube channel, each due at its own adaptive interval
+        self.poller = Scheduler('youtube')
+        self.subscribers = {}  # youtube_channel_id -> subscription docs
+        self.feed_state = {}  # youtube_channel_id -> FeedState
+        self.fetch_semaphore = asyncio.Semaphore(Config.VIDEO_FETCH_CONCURRENCY)
+        self.notify_locks = {}  # youtube_channel_id -> Lock, so a push and a poll can't announce a video twice
+        # Push notifications through the dashboard's WebSub route; polling stays on as a slow fallback
+        self.websub = None
+        if Config.WEBSUB_CALLBACK_URL:
+            self.websub = WebSubClient(Config.WEBSUB_HUB_URL, Config.WEBSUB_CALLBACK_URL, Config.WEBSUB_SECRET)
+        self.lease_renewals = Scheduler('websub')
+        self.background_tasks = set()  # referenced so they aren't garbage-collected mid-run
+        self.sync_subscriptions.start()
     
     def cog_unload(self):
-        self.check_videos.cancel()
+        self.sync_subscriptions.cancel()
+        self.poller.stop()
+        self.lease_renewals.stop()
+        asyncio.create_task(self.feeds.close())
+        if self.websub:
+            asyncio.create_task(self.websub.close())
+    
+    def spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+        return task
     
     @discord.slash_command(name='toggle_notifications', description='[ADMIN] Toggle YouTube video notifications')
     @discord.default_permissions(manage_guild=True)
     async def toggle_notifications(self, ctx):
         guild_id = str(ctx.guild.id)
         
-        current = server_settings.get(guild_id, 'notifications_enabled', True)
-        server_settings.set(guild_id, 'notifications_enabled', not current)
+        current = await server_settings.get(guild_id, 'notifications_enabled', True)
+        await server_settings.set(guild_id, 'notifications_enabled', not current)
         
         status = "enabled ✅" if not current else "disabled ❌"
         
@@ -42,7 +97,7 @@ class YouTube(commands.Cog):
     @discord.slash_command(name='notification_status', description='Check if notifications are enabled')
     async def notification_status(self, ctx):
         guild_id = str(ctx.guild.id)
-        enabled = server_settings.get(guild_id, 'notifications_enabled', True)
+        enabled = await server_settings.get(guild_id, 'notifications_enabled', True)
         
         status = "enabled ✅" if enabled else "disabled ❌"
         
@@ -55,66 +110,373 @@ class YouTube(commands.Cog):
         
         await ctx.respond(embed=embed)
     
-    @tasks.loop(seconds=Config.VIDEO_CHECK_INTERVAL)
-    async def check_videos(self):
-        """Check for new YouTube videos"""
+    @discord.slash_command(name='youtube_subscribe', description='[ADMIN] Post new videos from a YouTube channel')
+    @option("youtube_channel_id", description="YouTube channel ID (starts with UC)")
+    @option("channel", discord.TextChannel, description="Where to post notifications")
+    @discord.default_permissions(manage_guild=True)
+    async def youtube_subscribe(self, ctx, youtube_channel_id: str, channel: discord.TextChannel):
+        guild_id = str(ctx.guild.id)
+        youtube_channel_id = youtube_channel_id.strip()
+        
+        if not YOUTUBE_CHANNEL_ID.match(youtube_channel_id):
+            await ctx.respond('❌ That doesn\'t look like a YouTube channel ID (it should start with `UC`).', ephemeral=True)
+            return
+        
+        subscriptions = await bot_data.get_youtube_subscriptions(guild_id)
+        if len(subscriptions) >= Config.YOUTUBE_MAX_SUBSCRIPTIONS:
+            await ctx.respond(f'❌ This server already follows {Config.YOUTUBE_MAX_SUBSCRIPTIONS} channels.', ephemeral=True)
+            return
+        
+        await ctx.defer()
+        
+        # Mark the videos already in the feed as seen so the first poll doesn't announce old uploads
+        try:
+            entries = await self.feeds.fetch(FEED_URL.format(youtube_channel_id), conditional=False)
+        except Exception:
+            entries = None
+        if entries is None:
+            await ctx.followup.send('❌ Couldn\'t load that channel\'s feed - check the ID.')
+            return
+        
+        seen_ids = [entry.id for entry in entries]
+        added = await bot_data.add_youtube_subscription(guild_id, youtube_channel_id, str(channel.id), seen_ids)
+        if not added:
+            await ctx.followup.send('❌ This server already follows that channel.')
+            return
+        
+        self.add_subscriber({
+            'guild_id': guild_id,
+            'youtube_channel_id': youtube_channel_id,
+            'notify_channel_id': str(channel.id),
+            'seen_ids': seen_ids[::-1]
+        })
+        await ctx.followup.send(f'✅ New videos from `{youtube_channel_id}` will be posted in {channel.mention}')
+    
+    @discord.slash_command(name='youtube_unsubscribe', description='[ADMIN] Stop posting videos from a YouTube channel')
+    @option("youtube_channel_id", description="YouTube channel ID")
+    @discord.default_permissions(manage_guild=True)
+    async def youtube_unsubscribe(self, ctx, youtube_channel_id: str):
+        guild_id = str(ctx.guild.id)
+        youtube_channel_id = youtube_channel_id.strip()
+        removed = await bot_data.remove_youtube_subscription(guild_id, youtube_channel_id)
+        if removed:
+            self.remove_subscriber(guild_id, youtube_channel_id)
+            await ctx.respond(f'✅ Unsubscribed from `{youtube_channel_id}`')
+        else:
+            await ctx.respond('❌ This server doesn\'t follow that channel.', ephemeral=True)
+    
+    @discord.slash_command(name='youtube_subscriptions', description='List the YouTube channels this server follows')
+    async def youtube_subscriptions(self, ctx):
+        subscriptions = await bot_data.get_youtube_subscriptions(str(ctx.guild.id))
+        if not subscriptions:
+            await ctx.respond('No YouTube channels followed yet! Use `/youtube_subscribe`.')
+            return
+        
+        embed = discord.Embed(title='📺 YouTube Subscriptions', color=0xFF0000)
+        embed.description = '\n'.join(
+            f'`{sub["youtube_channel_id"]}` → <#{sub["notify_channel_id"]}>' for sub in subscriptions
+        )
+        await ctx.respond(embed=embed)
+    
+    async def seed_legacy_subscription(self):
+        """Turn the old single-channel YOUTUBE_CHANNEL_ID/NOTIFICATION_CHANNEL_ID env setup into a subscription"""
         channel_id = os.getenv('YOUTUBE_CHANNEL_ID')
         notif_channel_id = os.getenv('NOTIFICATION_CHANNEL_ID')
-        
         if not channel_id or not notif_channel_id:
             return
         
+        channel = self.bot.get_channel(int(notif_channel_id))
+        if not channel:
+            return
+        
+        guild_id = str(channel.guild.id)
+        # Import once, so a later /youtube_unsubscribe isn't undone by the next restart
+        legacy = await bot_data.get_legacy_video_state(guild_id)
+        if legacy.get('imported_to_subscriptions'):
+            return
+        
+        # No seen_ids: the first poll only announces videos newer than the old last_video_id
+        last_video_id = legacy.get('last_video_id')
+        if await bot_data.add_youtube_subscription(guild_id, channel_id, notif_channel_id, last_video_id=last_video_id):
+            logger.info(f'📺 Imported YOUTUBE_CHANNEL_ID {channel_id} as a subscription for guild {guild_id}')
+        await bot_data.mark_legacy_video_imported(guild_id)
+    
+    def build_video_embed(self, entry) -> discord.Embed:
+        embed = discord.Embed(
+            title='🎬 New YouTube Video!',
+            description=f'**{entry.title}**',
+            url=entry.link,
+            color=0xFF0000,
+            timestamp=datetime.utcnow()
+        )
+        
+        if entry.thumbnail:
+            embed.set_thumbnail(url=entry.thumbnail)
+        
+        embed.add_field(name='Channel', value=entry.author, inline=True)
+        if entry.published:
+            pub_date = datetime.fromisoformat(entry.published)
+            embed.add_field(name='Published', value=pub_date.strftime('%Y-%m-%d %H:%M'), inline=True)
+        return embed
+    
+    def add_subscriber(self, sub: dict):
+        subs = self.subscribers.setdefault(sub['youtube_channel_id'], [])
+        subs.append(sub)
+        if sub['youtube_channel_id'] not in self.poller:
+            self.schedule_poll(sub['youtube_channel_id'], Config.YOUTUBE_MIN_POLL_INTERVAL)
+        self.spawn(self.request_push(sub['youtube_channel_id']))
+    
+    def remove_subscriber(self, guild_id: str, youtube_channel_id: str):
+        subs = [sub for sub in self.subscribers.get(youtube_channel_id, []) if sub['guild_id'] != guild_id]
+        if subs:
+            self.subscribers[youtube_channel_id] = subs
+        else:
+            self.drop_feed(youtube_channel_id)
+    
+    def drop_feed(self, youtube_channel_id: str):
+        self.subscribers.pop(youtube_channel_id, None)
+        self.feed_state.pop(youtube_channel_id, None)
+        self.notify_locks.pop(youtube_channel_id, None)
+        self.poller.cancel(youtube_channel_id)
+        self.lease_renewals.cancel(youtube_channel_id)
+        if self.websub:
+            self.spawn(self.cancel_push(youtube_channel_id))
+    
+    def schedule_poll(self, youtube_channel_id: str, delay: float):
+        self.poller.schedule(
+            youtube_channel_id, time.time() + delay,
+            lambda: self.poll_feed(youtube_channel_id)
+        )
+    
+    def next_interval(self, youtube_channel_id: str) -> float:
+        """Poll a few times per typical gap between uploads, within limits, with jitter"""
+        state = self.feed_state.get(youtube_channel_id)
+        if self.websub and self.websub.is_active(FEED_URL.format(youtube_channel_id)):
+            # Pushes announce uploads; polling only backs them up
+            interval = Config.WEBSUB_FALLBACK_POLL_INTERVAL
+        else:
+            if state and state.avg_gap:
+                interval = state.avg_gap / Config.YOUTUBE_POLLS_PER_UPLOAD
+            else:
+                interval = Config.VIDEO_CHECK_INTERVAL
+            interval = min(max(interval, Config.YOUTUBE_MIN_POLL_INTERVAL), Config.YOUTUBE_MAX_POLL_INTERVAL)
+        return interval * random.uniform(1 - Config.YOUTUBE_POLL_JITTER, 1 + Config.YOUTUBE_POLL_JITTER)
+    
+    @tasks.loop(seconds=Config.YOUTUBE_RESYNC_INTERVAL)
+    async def sync_subscriptions(self):
+        """Reload subscriptions from the database (picks up changes made by other instances)"""
         try:
-            feed_url = f'https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}'
-            feed = await asyncio.to_thread(feedparser.parse, feed_url)
+            if not self.legacy_seeded:
+                self.legacy_seeded = True
+                await self.seed_legacy_subscription()
             
-            if feed.entries:
-                latest = feed.entries[0]
-                video_id = latest.id
-                
-                # Get the notification channel to determine guild_id
-                channel = self.bot.get_channel(int(notif_channel_id))
-                if not channel:
-                    return
-                
-                guild_id = str(channel.guild.id)
-                
-                # FIX: Use proper method with guild_id parameter
-                last_video_id = bot_data.get_last_video_id(guild_id)
-                
-                if video_id != last_video_id and last_video_id:
-                    # Check if notifications are enabled
-                    if not server_settings.get(guild_id, 'notifications_enabled', True):
-                        logger.info(f'🔕 Notifications disabled for guild {guild_id}')
-                        bot_data.set_last_video_id(guild_id, video_id)
-                        return
-
-                    embed = discord.Embed(
-                        title='🎬 New YouTube Video!',
-                        description=f'**{latest.title}**',
-                        url=latest.link,
-                        color=0xFF0000,
-                        timestamp=datetime.utcnow()
-                    )
-                    
-                    if hasattr(latest, 'media_thumbnail'):
-                        embed.set_thumbnail(url=latest.media_thumbnail[0]['url'])
-                    
-                    embed.add_field(name='Channel', value=latest.author, inline=True)
-                    pub_date = datetime.strptime(latest.published, '%Y-%m-%dT%H:%M:%S%z')
-                    embed.add_field(name='Published', value=pub_date.strftime('%Y-%m-%d %H:%M'), inline=True)
-                    
-                    await channel.send('📺 New video alert! @everyone', embed=embed)
-                    logger.info(f'📺 New video notification sent: {latest.title}')
-                
-                bot_data.set_last_video_id(guild_id, video_id)
+            # Every feed is polled once per interval, however many guilds follow it
+            subscribers = {}
+            for sub in await bot_data.get_youtube_subscriptions():
+                subscribers.setdefault(sub['youtube_channel_id'], []).append(sub)
+            
+            for youtube_channel_id in set(self.subscribers) - set(subscribers):
+                self.drop_feed(youtube_channel_id)
+            self.subscribers = subscribers
+            
+            for youtube_channel_id in subscribers:
+                if youtube_channel_id not in self.poller:
+                    # Spread first polls out instead of fetching every feed at once
+                    self.schedule_poll(youtube_channel_id, random.uniform(0, Config.VIDEO_CHECK_INTERVAL))
+            
+            self.poller.start()
+            self.lease_renewals.start()
+            
+            # Also retries push subscriptions that failed or lapsed
+            await asyncio.gather(*(self.request_push(youtube_channel_id) for youtube_channel_id in subscribers))
+        
+        except Exception as e:
+            logger.error(f'❌ Error loading YouTube subscriptions: {e}')
+    
+    async def poll_feed(self, youtube_channel_id: str):
+        try:
+            subs = self.subscribers.get(youtube_channel_id)
+            if subs:
+                await self.check_feed(youtube_channel_id, subs)
+        finally:
+            if youtube_channel_id in self.subscribers:
+                self.schedule_poll(youtube_channel_id, self.next_interval(youtube_channel_id))
+    
+    async def check_feed(self, youtube_channel_id: str, subs: list):
+        url = FEED_URL.format(youtube_channel_id)
+        state = self.feed_state.setdefault(youtube_channel_id, FeedState())
+        # Parsing can stop at a video every subscriber has already seen (after one full read for upload history)
+        seen_by_all = set.intersection(*(set(self.seen_videos(sub)) for sub in subs))
+        try:
+            async with self.fetch_semaphore:
+                entries = await self.feeds.fetch(url, stop_ids=seen_by_all if state.primed else ())
+        except Exception as e:
+            logger.error(f'❌ Error fetching feed {youtube_channel_id}: {e}')
+            return
+        
+        # None = 304 Not Modified
+        if not entries:
+            return
         
+        state.record_uploads([datetime.fromisoformat(entry.published).timestamp() for entry in entries if entry.published])
+        state.primed = True
+        
+        await self.notify_all(youtube_channel_id, subs, entries)
+    
+    async def notify_all(self, youtube_channel_id: str, subs: list, entries: list):
+        """Announce entries (newest first) each subscriber hasn't seen, then save every subscription's new IDs at once"""
+        async with self.notify_locks.setdefault(youtube_channel_id, asyncio.Lock()):
+            seen = {}
+            for sub in subs:
+                try:
+                    seen[(sub['guild_id'], youtube_channel_id)] = await self.notify_subscriber(sub, entries)
+                except Exception as e:
+                    # Make the next poll download the feed again instead of getting a 304
+                    self.feeds.forget(FEED_URL.format(youtube_channel_id))
+                    logger.error(f'❌ Error notifying guild {sub["guild_id"]} about {youtube_channel_id}: {e}')
+            
+            try:
+                await bot_data.add_youtube_seen_videos(seen)
+            except Exception as e:
+                logger.error(f'❌ Error saving seen videos for {youtube_channel_id}: {e}')
+    
+    async def request_push(self, youtube_channel_id: str):
+        """Subscribe to the feed on the WebSub hub unless a lease is live or a request is in flight"""
+        topic = FEED_URL.format(youtube_channel_id)
+        if not self.websub or self.websub.is_active(topic) or self.websub.is_pending(topic):
+            return
+        try:
+            async with self.fetch_semaphore:
+                await self.websub.subscribe(topic)
+        except Exception as e:
+            logger.error(f'❌ Error subscribing to WebSub push for {youtube_channel_id}: {e}')
+    
+    async def cancel_push(self, youtube_channel_id: str):
+        try:
+            await self.websub.unsubscribe(FEED_URL.format(youtube_channel_id))
         except Exception as e:
-            logger.error(f'❌ Error checking videos: {e}')
+            logger.error(f'❌ Error unsubscribing from WebSub push for {youtube_channel_id}: {e}')
+    
+    async def renew_push(self, youtube_channel_id: str):
+        if youtube_channel_id not in self.subscribers:
+            return
+        try:
+            await self.websub.subscribe(FEED_URL.format(youtube_channel_id))
+        except Exception as e:
+            # The lease runs out and polling speeds back up until the resync loop retries
+            logger.error(f'❌ Error renewing WebSub lease for {youtube_channel_id}: {e}')
+    
+    def feed_channel_id(self, topic: str):
+        prefix = FEED_URL.format('')
+        return topic[len(prefix):] if topic.startswith(prefix) else None
+    
+    def websub_verified(self, mode: str, topic: str, lease_seconds: int = None) -> bool:
+        """Called by the dashboard for a hub challenge; True if it should be confirmed"""
+        youtube_channel_id = self.feed_channel_id(topic)
+        if not youtube_channel_id or not self.websub.verify_intent(mode, topic, lease_seconds):
+            return False
+        
+        if mode == 'subscribe':
+            expires = self.websub.leases[topic]
+            self.lease_renewals.schedule(
+                youtube_channel_id, max(time.time(), expires - Config.WEBSUB_RENEW_MARGIN),
+                lambda: self.renew_push(youtube_channel_id)
+            )
+            # Push covers this feed now, so back polling off (a running poll reschedules itself)
+            if youtube_channel_id in self.poller:
+                self.schedule_poll(youtube_channel_id, self.next_interval(youtube_channel_id))
+            logger.info(f'📡 WebSub lease confirmed for {youtube_channel_id} until {datetime.utcfromtimestamp(expires):%Y-%m-%d %H:%M}')
+        return True
+    
+    def websub_denied(self, topic: str, reason: str = None):
+        youtube_channel_id = self.feed_channel_id(topic)
+        self.websub.deny(topic)
+        if youtube_channel_id:
+            self.lease_renewals.cancel(youtube_channel_id)
+        logger.warning(f'⚠️ WebSub hub denied {topic}: {reason}')
+    
+    async def handle_push(self, body: bytes):
+        """Announce entries pushed through WebSub"""
+        try:
+            entries = parse_feed(body)
+        except Exception as e:
+            logger.error(f'❌ Error parsing WebSub push: {e}')
+            return
+        
+        by_channel = {}
+        for entry in entries:
+            by_channel.setdefault(entry.channel_id, []).append(entry)
+        
+        for youtube_channel_id, channel_entries in by_channel.items():
+            subs = self.subscribers.get(youtube_channel_id)
+            if not subs:
+                continue
+            
+            state = self.feed_state.get(youtube_channel_id)
+            if not state or not state.primed:
+                # No upload history to compare against yet - let a poll sort it out
+                if youtube_channel_id in self.poller:
+                    self.schedule_poll(youtube_channel_id, 0)
+                continue
+            
+            # Hubs also push when an old video's title or description changes
+            uploads = [(datetime.fromisoformat(entry.published).timestamp(), entry) for entry in channel_entries if entry.published]
+            uploads = [(published, entry) for published, entry in uploads if published > (state.last_upload or 0)]
+            if not uploads:
+                continue
+            
+            state.record_uploads([published for published, entry in uploads])
+            uploads.sort(key=lambda upload: upload[0], reverse=True)
+            await self.notify_all(youtube_channel_id, subs, [entry for published, entry in uploads])
+    
+    def seen_videos(self, sub: dict) -> deque:
+        """Bounded history of video IDs a subscription has seen (older documents only have last_video_id)"""
+        seen = sub.get('seen')
+        if seen is None:
+            seen_ids = sub.get('seen_ids') or ([sub['last_video_id']] if sub.get('last_video_id') else [])
+            seen = sub['seen'] = deque(seen_ids, maxlen=Config.YOUTUBE_SEEN_IDS)
+        return seen
+    
+    async def notify_subscriber(self, sub: dict, entries: list) -> list:
+        """Post every unseen entry; returns the newly seen IDs oldest first"""
+        guild_id = sub['guild_id']
+        seen = self.seen_videos(sub)
+        new = [entry for entry in reversed(entries) if entry.id not in seen]
+        if not new:
+            return []
+        
+        announce = new
+        if 'seen_ids' not in sub:
+            # Older subscriptions only know the last announced video (or nothing): post what's newer, record the rest
+            last_video_id = sub.get('last_video_id')
+            feed_ids = [entry.id for entry in entries]
+            if last_video_id in feed_ids:
+                announce = new[len(new) - feed_ids.index(last_video_id):]
+            else:
+                announce = new[-1:] if last_video_id else []
+        
+        if announce:
+            channel = self.bot.get_channel(int(sub['notify_channel_id']))
+            if not channel:
+                return []
+            
+            # Check if notifications are enabled
+            if await server_settings.get(guild_id, 'notifications_enabled', True):
+                content = '📺 New video alert! @everyone' if len(announce) == 1 else f'📺 {len(announce)} new videos! @everyone'
+                for i in range(0, len(announce), Config.YOUTUBE_EMBEDS_PER_MESSAGE):
+                    batch = announce[i:i + Config.YOUTUBE_EMBEDS_PER_MESSAGE]
+                    await channel.send(content if i == 0 else None, embeds=[self.build_video_embed(entry) for entry in batch])
+                logger.info(f'📺 {len(announce)} new video notification(s) sent to guild {guild_id}: {announce[-1].title}')
+            else:
+                logger.info(f'🔕 Notifications disabled for guild {guild_id}')
+        
+        seen.extend(entry.id for entry in new)
+        sub['seen_ids'] = seen  # the history is complete from here on
+        return [entry.id for entry in new]
     
-    @check_videos.before_loop
-    async def before_check_videos(self):
+    @sync_subscriptions.before_loop
+    async def before_sync_subscriptions(self):
         await self.bot.wait_until_ready()
 
 def setup(bot):
-    bot.add_cog(YouTube(bot))
\ No newline at end of file
+    bot.add_cog(YouTube(bot))
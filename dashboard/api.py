@@ -1,6 +1,7 @@
 from aiohttp import web
 import aiohttp_session
 import aiohttp
+from utils.database import bot_data
 from .utils import get_guild_config, update_guild_config, get_guild_stats, check_user_permissions
 
 async def handle_api_guilds(request):
@@ -134,14 +135,12 @@ async def handle_api_leaderboard(request):
     if not has_permission:
         return web.json_response({'error': 'No permission'}, status=403)
     
-    db = request.app['db']
     bot = request.app['bot']
     
-    # Get top users by XP
-    users = await db.users.find(
-        {'guild_id': str(guild_id)},
-        {'user_id': 1, 'xp': 1, 'level': 1, 'balance': 1}
-    ).sort('xp', -1).limit(50).to_list(50)
+    # Get top users by level/XP with their coin totals
+    users = await bot_data.get_leaderboard(str(guild_id), limit=50)
+    for user in users:
+        user['balance'] = user['total_coins']
     
     # Try to get usernames from Discord
     guild = bot.get_guild(int(guild_id))
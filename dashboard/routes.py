@@ -9,6 +9,7 @@ from .api import (
     handle_api_update_config,
     handle_api_leaderboard
 )
+from .websub import handle_websub_verify, handle_websub_push
 
 def setup_routes(app):
     """Setup all dashboard routes"""
@@ -29,4 +30,8 @@ def setup_routes(app):
     app.router.add_get('/api/guild/{guild_id}/stats', handle_api_guild_stats)
     app.router.add_get('/api/guild/{guild_id}/config', handle_api_get_config)
     app.router.add_post('/api/guild/{guild_id}/config', handle_api_update_config)
-    app.router.add_get('/api/guild/{guild_id}/leaderboard', handle_api_leaderboard)
\ No newline at end of file
+    app.router.add_get('/api/guild/{guild_id}/leaderboard', handle_api_leaderboard)
+    
+    # WebSub callback for YouTube upload notifications
+    app.router.add_get('/websub/youtube', handle_websub_verify)
+    app.router.add_post('/websub/youtube', handle_websub_push)
\ No newline at end of file
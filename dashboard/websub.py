@@ -0,0 +1,46 @@
+from aiohttp import web
+import logging
+
+logger = logging.getLogger('tooly_bot.dashboard')
+
+def get_youtube_cog(request):
+    cog = request.app['bot'].get_cog('YouTube')
+    return cog if cog and cog.websub else None
+
+async def handle_websub_verify(request):
+    """Answer the hub's subscription challenge"""
+    cog = get_youtube_cog(request)
+    if not cog:
+        return web.Response(status=404)
+    
+    params = request.query
+    mode = params.get('hub.mode')
+    topic = params.get('hub.topic', '')
+    
+    if mode == 'denied':
+        cog.websub_denied(topic, params.get('hub.reason'))
+        return web.Response(text='ok')
+    
+    try:
+        lease_seconds = int(params['hub.lease_seconds']) if 'hub.lease_seconds' in params else None
+    except ValueError:
+        lease_seconds = None
+    
+    if not cog.websub_verified(mode, topic, lease_seconds):
+        return web.Response(status=404)
+    return web.Response(text=params.get('hub.challenge', ''))
+
+async def handle_websub_push(request):
+    """Accept a pushed feed update"""
+    cog = get_youtube_cog(request)
+    if not cog:
+        return web.Response(status=404)
+    
+    body = await request.read()
+    # Bad signatures are acknowledged but ignored, as the WebSub spec asks
+    if not cog.websub.check_signature(body, request.headers.get('X-Hub-Signature')):
+        logger.warning('⚠️ Ignoring WebSub push with an invalid signature')
+        return web.Response(status=202)
+    
+    cog.spawn(cog.handle_push(body))
+    return web.Response(status=202)
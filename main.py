@@ -4,7 +4,6 @@ import os
 import asyncio
 import logging
 from aiohttp import web
-from motor.motor_asyncio import AsyncIOMotorClient
 
 # Setup logging
 logging.basicConfig(
@@ -13,22 +12,32 @@ logging.basicConfig(
 )
 logger = logging.getLogger('tooly_bot')
 
+# Database setup
+mongo_uri = os.getenv('MONGO_URI')
+if not mongo_uri:
+    logger.error('❌ MONGO_URI environment variable not set!')
+    exit(1)
+
+# Shared Motor client - the cogs and the dashboard use the same connection pool
+from utils.database import db, bot_data, setup_database
+
 # Bot Setup
 intents = discord.Intents.default()
 intents.message_content = True
 intents.members = True
 intents.reactions = True
 
-bot = discord.Bot(intents=intents, auto_sync_commands=True)
-
-# Database setup
-mongo_uri = os.getenv('MONGO_URI')
-if not mongo_uri:
-    logger.error('❌ MONGO_URI environment variable not set!')
-    exit(1)
+class ToolyBot(discord.Bot):
+    async def close(self):
+        # Write back anything still sitting in the write-behind caches
+        try:
+            await bot_data.save()
+            logger.info('💾 Cached data flushed')
+        except Exception as e:
+            logger.error(f'❌ Failed to flush cached data on shutdown: {e}')
+        await super().close()
 
-mongo_client = AsyncIOMotorClient(mongo_uri)
-db = mongo_client['tooly_bot']
+bot = ToolyBot(intents=intents, auto_sync_commands=True)
 
 # --- Web Server Startup ---
 async def start_web_server():
@@ -57,6 +66,9 @@ async def on_ready():
         )
     )
 
+    # Indexes and startup caches
+    await setup_database()
+
     # Start dashboard
     await start_web_server()
     logger.info('🚀 All systems operational!')
@@ -0,0 +1,185 @@
+"""In-memory caches used by the data layer"""
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class WriteBehindCache:
+    """LRU record cache that remembers which entries still need writing back.
+
+    Dirty entries are never evicted; they leave the dirty set only through
+    take_dirty() (and come back through restore_dirty() if the write fails).
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self.dirty: Dict[Hashable, float] = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a cached record (and mark it recently used)"""
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        """Cache a clean record loaded from the database"""
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        self._trim()
+
+    def mark_dirty(self, key: Hashable, value: Any):
+        """Cache a modified record and queue it for the next flush"""
+        self.dirty.setdefault(key, time.monotonic())
+        self.put(key, value)
+
+    def oldest_dirty_age(self) -> float:
+        """Seconds since the oldest unflushed change (0 if nothing is dirty)"""
+        if not self.dirty:
+            return 0
+        return time.monotonic() - min(self.dirty.values())
+
+    def take_dirty(self) -> List[Tuple[Hashable, Any]]:
+        """Pop every dirty record for writing"""
+        items = [(key, self.entries[key]) for key in self.dirty if key in self.entries]
+        self.dirty.clear()
+        return items
+
+    def restore_dirty(self, items: List[Tuple[Hashable, Any]]):
+        """Put records back in the dirty set after a failed write"""
+        now = time.monotonic()
+        for key, value in items:
+            if key not in self.entries:
+                self.entries[key] = value
+            self.dirty.setdefault(key, now)
+
+    def discard(self, predicate: Callable[[Hashable], bool]):
+        """Drop every record whose key matches"""
+        for key in [k for k in self.entries if predicate(k)]:
+            del self.entries[key]
+            self.dirty.pop(key, None)
+
+    def _trim(self):
+        if len(self.entries) <= self.max_entries:
+            return
+        for key in list(self.entries):
+            if len(self.entries) <= self.max_entries:
+                break
+            if key not in self.dirty:
+                del self.entries[key]
+
+
+class CooldownIndex:
+    """Bounded map of key -> last-use timestamp for a fixed cooldown window.
+
+    Entries are recorded roughly in time order, so expired or overflowing
+    entries are popped from the front in O(1) per entry.
+    """
+
+    def __init__(self, window: float, max_entries: int):
+        self.window = window
+        self.max_entries = max_entries
+        self.entries: 'OrderedDict[Hashable, float]' = OrderedDict()
+        self._latest = 0.0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def is_active(self, key: Hashable, now: float) -> bool:
+        """True if key was used less than `window` seconds before now"""
+        last = self.entries.get(key)
+        return last is not None and now - last < self.window
+
+    def touch(self, key: Hashable, timestamp: float):
+        """Record a use of key at timestamp"""
+        self.entries[key] = timestamp
+        self.entries.move_to_end(key)
+        self._latest = max(self._latest, timestamp)
+        self._expire(self._latest)
+
+    def _expire(self, now: float):
+        while self.entries:
+            key, last = next(iter(self.entries.items()))
+            if len(self.entries) <= self.max_entries and now - last < self.window:
+                break
+            del self.entries[key]
+
+
+class TTLCache:
+    """LRU cache whose entries also expire after a fixed number of seconds"""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a live entry (and mark it recently used)"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return default
+        if entry[0] <= time.monotonic():
+            del self.entries[key]
+            return default
+        self.entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: Hashable, value: Any):
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        self.entries.pop(key, None)
+
+    def discard(self, predicate: Callable[[Hashable], bool]):
+        """Drop every entry whose key matches"""
+        for key in [k for k in self.entries if predicate(k)]:
+            del self.entries[key]
+
+    def clear(self):
+        self.entries.clear()
+
+
+class SlidingWindowCounter:
+    """Approximate count of events in the last `window` seconds using two fixed buckets.
+
+    The previous bucket is weighted by how much of it still overlaps the window,
+    so memory stays constant however many events arrive.
+    """
+
+    __slots__ = ('window', 'bucket_start', 'current', 'previous')
+
+    def __init__(self, window: float):
+        self.window = window
+        self.bucket_start = 0.0
+        self.current = 0
+        self.previous = 0
+
+    def _roll(self, now: float):
+        elapsed = now - self.bucket_start
+        if elapsed >= 2 * self.window:
+            self.previous, self.current = 0, 0
+            self.bucket_start = now
+        elif elapsed >= self.window:
+            self.previous, self.current = self.current, 0
+            self.bucket_start += self.window
+
+    def hit(self, now: float) -> float:
+        """Record an event and return the estimated count in the window"""
+        self._roll(now)
+        self.current += 1
+        return self.estimate(now)
+
+    def estimate(self, now: float) -> float:
+        self._roll(now)
+        overlap = 1 - (now - self.bucket_start) / self.window
+        return self.previous * overlap + self.current
@@ -1,4 +1,5 @@
 """Configuration constants for Tooly Bot"""
+import os
 
 class Config:
     # Cooldowns (in seconds)
@@ -8,6 +9,7 @@ class Config:
     FISH_COOLDOWN = 120
     GAMBLE_COOLDOWN = 0
     NAME_MENTION_COOLDOWN = 30
+    XP_COOLDOWN_INDEX_SIZE = 100000  # max (guild, user) pairs kept in memory
     
     # XP & Leveling
     XP_MIN, XP_MAX = 10, 25
@@ -19,18 +21,76 @@ class Config:
     WORK_MIN, WORK_MAX = 100, 300
     GAMBLE_MIN = 10
     GAMBLE_MAX_PERCENT = 0.5
+    BULK_WRITE_CHUNK_SIZE = 1000  # users per bulk_write for /give everyone (and bulk removals)
     
     # Moderation
     WARN_THRESHOLD = 3
-    TIMEOUT_DURATION = 60
+    WARNING_EXPIRY_DAYS = 0  # 0 = warnings never expire
+    TIMEOUT_DURATION = 60  # minutes, default for /timeout
+    TIMEOUT_EXPIRY_RETRY = 300  # seconds before retrying a timeout that couldn't be lifted
+    MUTE_SETUP_CONCURRENCY = 5  # channel overwrite edits in flight (discord.py still honours rate limits)
+    MUTE_SETUP_PROGRESS_INTERVAL = 5  # seconds between progress message edits
+    
+    # Automod
+    AUTOMOD_ENABLED = os.getenv('AUTOMOD_ENABLED', '').lower() in ('1', 'true', 'yes')
+    AUTOMOD_LOG_CHANNEL = os.getenv('AUTOMOD_LOG_CHANNEL')
+    AUTOMOD_SPAM_MESSAGES, AUTOMOD_SPAM_WINDOW = 5, 5  # 5 messages within 5 seconds
+    AUTOMOD_DUPLICATE_MESSAGES, AUTOMOD_DUPLICATE_WINDOW = 3, 30  # same text 3 times within 30 seconds
+    AUTOMOD_SPAM_TIMEOUT = 5  # minutes
+    AUTOMOD_LOG_INTERVAL = 10  # seconds between batched log posts
+    
+    # Raid protection (enabled per guild with /antiraid)
+    RAID_JOIN_THRESHOLD, RAID_JOIN_WINDOW = 10, 30  # 10 joins within 30 seconds
+    RAID_MODE_DURATION = 600  # seconds raid mode lasts after the last join
+    RAID_MIN_ACCOUNT_AGE = 7  # days
+    RAID_NAME_SIMILARITY = 0.8
+    RAID_SIMILAR_NAMES = 2  # recent joiners with a similar name
+    RAID_RECENT_JOINS = 50
+    RAID_TIMEOUT = 60  # minutes
+    RAID_ACTIONS_PER_SECOND = 2
     
     # Files & Intervals
     DATA_FILE = 'data/botdata.json'
     SETTINGS_FILE = 'data/server_settings.json'
+    LEGACY_TIMEOUT_FILE = 'timeout_roles.json'  # imported into Mongo on startup if present
     REACTIONS_FILE = 'data/reaction_roles.json'
     AUTOSAVE_INTERVAL = 300
+    
+    # Write-behind cache for levels (economy reads get a short TTL cache)
+    CACHE_MAX_ENTRIES = 50000
+    CACHE_MAX_STALENESS = 60  # flush early once a pending change is this old
+    ECONOMY_CACHE_TTL = 15  # seconds a cached balance is trusted
+    
+    # Store level/economy/profile/inventory on one 'members' document per user
+    # (run `python -m utils.migrate_members` before switching an existing database)
+    UNIFIED_MEMBER_STORAGE = os.getenv('UNIFIED_MEMBER_STORAGE', '').lower() in ('1', 'true', 'yes')
+    
+    # Per-guild settings cache (other instances invalidate it through a change stream when available)
+    SETTINGS_CACHE_TTL = 300
+    SETTINGS_CACHE_MAX_ENTRIES = 10000
     VIDEO_CHECK_INTERVAL = 300
+    VIDEO_FETCH_CONCURRENCY = 5  # YouTube feeds downloaded at once
+    FEED_FETCH_TIMEOUT = 15
+    YOUTUBE_MIN_POLL_INTERVAL, YOUTUBE_MAX_POLL_INTERVAL = 120, 3600  # adaptive per-feed polling bounds
+    YOUTUBE_POLLS_PER_UPLOAD = 12  # polls per average gap between a channel's uploads
+    YOUTUBE_POLL_JITTER = 0.2  # +/- fraction applied to every interval
+    YOUTUBE_RESYNC_INTERVAL = 600  # reload subscriptions from the database
+    YOUTUBE_MAX_SUBSCRIPTIONS = 25  # per guild
+    YOUTUBE_SEEN_IDS = 50  # video IDs remembered per subscription (a feed lists the latest 15)
+    YOUTUBE_EMBEDS_PER_MESSAGE = 10  # Discord's limit
+    
+    # WebSub push for new uploads (set to the public URL of the dashboard's /websub/youtube route)
+    WEBSUB_CALLBACK_URL = os.getenv('WEBSUB_CALLBACK_URL')
+    WEBSUB_HUB_URL = os.getenv('WEBSUB_HUB_URL', 'https://pubsubhubbub.appspot.com/subscribe')
+    WEBSUB_SECRET = os.getenv('WEBSUB_SECRET')  # random per start when unset
+    WEBSUB_LEASE_SECONDS = 432000  # 5 days
+    WEBSUB_RENEW_MARGIN = 3600  # renew this long before a lease runs out
+    WEBSUB_VERIFY_TIMEOUT = 300  # give up on a hub verification after this long (the resync loop asks again)
+    WEBSUB_FALLBACK_POLL_INTERVAL = 21600  # polling for feeds with a live push subscription
+    
     LEADERBOARD_UPDATE_INTERVAL = 3600
+    RANK_TOTAL_CACHE_TTL = 300
+    LEADERBOARD_UPDATE_CONCURRENCY = 10
 
 # Fish Types
 FISH_TYPES = [
@@ -1,204 +1,571 @@
 import os
+import json
+import time
+import asyncio
 import logging
-from datetime import datetime
-from copy import deepcopy
-from typing import Dict, Any
-from pymongo import MongoClient
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Iterable, Callable, Awaitable
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne, ReturnDocument
+from pymongo.errors import DuplicateKeyError, OperationFailure
+from utils.cache import WriteBehindCache, TTLCache
+from utils.records import Record, UserLevel, UserEconomy
+from utils.config import Config
 
 logger = logging.getLogger('tooly_bot.database')
 
-# MongoDB connection (synchronous - works with your existing code)
+# MongoDB connection (async - one shared Motor client/pool for the whole process)
 mongo_uri = os.getenv('MONGO_URI')
 if not mongo_uri:
     raise ValueError("❌ MONGO_URI environment variable not set!")
 
-client = MongoClient(mongo_uri)
-db = client['tooly_bot']
+mongo_client = AsyncIOMotorClient(mongo_uri)
+db = mongo_client['tooly_bot']
+
+# Per-member fields by data type. Everything else on a member record is economy data,
+# which lets cogs keep adding economy stats without touching this file.
+LEVEL_FIELDS = ('level', 'xp', 'lastMessage')
+PROFILE_FIELDS = ('customName', 'customPfp')
+INVENTORY_FIELDS = ('items',)
+RECORD_META_FIELDS = ('_id', 'guild_id', 'user_id', 'updated_at')
 
 class BotData:
     def __init__(self):
         """Initialize MongoDB collections"""
-        self.levels_col = db['levels']
-        self.economy_col = db['economy']
-        self.warnings_col = db['warnings']
+        self.unified = Config.UNIFIED_MEMBER_STORAGE
+        if self.unified:
+            # One document per (guild_id, user_id) holding level, economy, profile and inventory
+            self.members_col = db['members']
+            self.levels_col = self.members_col
+            self.economy_col = self.members_col
+            self.inventory_col = self.members_col
+            self.profiles_col = self.members_col
+        else:
+            self.levels_col = db['levels']
+            self.economy_col = db['economy']
+            self.inventory_col = db['inventory']
+            self.profiles_col = db['profiles']
+        # One document per warning (the old 'warnings' collection held an ever-growing array per user)
+        self.warnings_col = db['user_warnings']
+        self.warning_counts_col = db['warning_counts']
         self.videos_col = db['videos']
+        self.youtube_subs_col = db['youtube_subscriptions']
         self.leaderboards_col = db['leaderboards']
         self.shop_items_col = db['shop_items']
-        self.inventory_col = db['inventory']
-        self.profiles_col = db['profiles']
         self.bot_profiles_col = db['bot_profiles']
-        
+
+        # In unified mode members without level data must not count towards ranks
+        # (lastMessage is written with every XP award)
+        self._ranked_filter = {'lastMessage': {'$exists': True}} if self.unified else {}
+        self._economy_projection = {field: 0 for field in LEVEL_FIELDS + PROFILE_FIELDS + INVENTORY_FIELDS}
+
+        # Write-behind cache for the hot level records, keyed by (guild_id, user_id)
+        self.level_cache = WriteBehindCache(Config.CACHE_MAX_ENTRIES)
+        # Economy writes are atomic in Mongo, so reads are only cached briefly (other instances write too)
+        self.economy_cache = TTLCache(Config.ECONOMY_CACHE_TTL, Config.CACHE_MAX_ENTRIES)
+        self._flush_lock = asyncio.Lock()
+        self._flush_task = None
+        self._flush_timer = None  # fires when the oldest pending change reaches CACHE_MAX_STALENESS
+
+        # guild_id -> (ranked member count, expiry) for /rank
+        self._guild_totals: Dict[str, tuple] = {}
+
         logger.info('✅ MongoDB connection initialized')
-        
-        # Create indexes for better performance
+
+    async def ensure_indexes(self):
+        """Create indexes for better performance"""
         try:
-            self.levels_col.create_index([('guild_id', 1), ('user_id', 1)], unique=True)
-            self.economy_col.create_index([('guild_id', 1), ('user_id', 1)], unique=True)
-            self.profiles_col.create_index([('guild_id', 1), ('user_id', 1)], unique=True)
-            self.bot_profiles_col.create_index([('guild_id', 1)], unique=True)
-        except:
-            pass  # Indexes may already exist
-    
-    def load(self):
-        """No-op for MongoDB (backwards compatibility)"""
-        pass
-    
-    def save(self):
+            await self.levels_col.create_index([('guild_id', 1), ('user_id', 1)], unique=True)
+            await self.levels_col.create_index([('guild_id', 1), ('level', -1), ('xp', -1)])
+            await self.economy_col.create_index([('guild_id', 1), ('user_id', 1)], unique=True)
+            await self.profiles_col.create_index([('guild_id', 1), ('user_id', 1)], unique=True)
+            await self.inventory_col.create_index([('guild_id', 1), ('user_id', 1)], unique=True)
+            await self.bot_profiles_col.create_index([('guild_id', 1)], unique=True)
+            await self.warnings_col.create_index([('guild_id', 1), ('user_id', 1), ('timestamp', -1)])
+            await self.warnings_col.create_index('expires_at', expireAfterSeconds=0)
+            await self.warning_counts_col.create_index([('guild_id', 1), ('user_id', 1)], unique=True)
+            await self.youtube_subs_col.create_index([('guild_id', 1), ('youtube_channel_id', 1)], unique=True)
+            await self.youtube_subs_col.create_index('youtube_channel_id')
+        except Exception as e:
+            logger.warning(f'⚠️ Could not create indexes: {e}')
+
+    async def load(self):
         """No-op for MongoDB (backwards compatibility)"""
         pass
-    
-    def get_user_level(self, guild_id: str, user_id: str) -> Dict[str, Any]:
-        """Get user level data"""
-        data = self.levels_col.find_one({
-            'guild_id': guild_id,
-            'user_id': user_id
-        })
-        
-        if not data:
-            return {
-                'level': 1,
-                'xp': 0,
-                'lastMessage': 0
-            }
-        
-        return {
-            'level': data.get('level', 1),
-            'xp': data.get('xp', 0),
-            'lastMessage': data.get('lastMessage', 0)
-        }
-    
-    def set_user_level(self, guild_id: str, user_id: str, data: Dict[str, Any]):
-        """Set user level data"""
-        self.levels_col.update_one(
+
+    async def save(self):
+        """Flush dirty level records with one bulk_write"""
+        async with self._flush_lock:
+            await self._flush_cache(self.level_cache, self.levels_col)
+
+    async def _flush_cache(self, cache: WriteBehindCache, collection):
+        dirty = cache.take_dirty()
+        if not dirty:
+            return
+
+        ops = []
+        written = []
+        for (guild_id, user_id), record in dirty:
+            fields = record.take_dirty()
+            if not fields:
+                continue
+            ops.append(UpdateOne({'guild_id': guild_id, 'user_id': user_id}, self._record_update(record, fields), upsert=True))
+            written.append((record, fields))
+
+        if not ops:
+            return
+
+        try:
+            await collection.bulk_write(ops, ordered=False)
+            logger.debug(f'Flushed {len(ops)} records to {collection.name}')
+        except Exception as e:
+            for record, fields in written:
+                record.restore_dirty(fields)
+            cache.restore_dirty(dirty)
+            logger.error(f'❌ Failed to flush {len(ops)} records to {collection.name}: {e}')
+
+    def _schedule_flush_if_stale(self):
+        """Start a background flush once the oldest pending change is too old, or arm a timer for when it will be"""
+        if self._flush_task and not self._flush_task.done():
+            return
+
+        oldest = self.level_cache.oldest_dirty_age()
+        if oldest >= Config.CACHE_MAX_STALENESS:
+            self._cancel_flush_timer()
+            self._flush_task = asyncio.create_task(self._flush_stale())
+        elif self._flush_timer is None and self.level_cache.dirty:
+            # The next write may be a long way off, so don't rely on it to notice the deadline
+            self._arm_flush_timer(Config.CACHE_MAX_STALENESS - oldest)
+
+    def _arm_flush_timer(self, delay: float):
+        self._flush_timer = asyncio.get_running_loop().call_later(delay, self._on_flush_timer)
+
+    def _cancel_flush_timer(self):
+        if self._flush_timer:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+    def _on_flush_timer(self):
+        self._flush_timer = None
+        self._schedule_flush_if_stale()
+
+    async def _flush_stale(self):
+        await self.save()
+        self._flush_task = None
+        if self._flush_timer is None and self.level_cache.dirty:
+            # Changes made during the flush keep their own deadline; a failed flush retries after a full period
+            oldest = self.level_cache.oldest_dirty_age()
+            remaining = Config.CACHE_MAX_STALENESS - oldest
+            self._arm_flush_timer(remaining if remaining > 0 else Config.CACHE_MAX_STALENESS)
+
+    @staticmethod
+    def _record_update(record: Record, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """$set only the changed fields; new documents still get every core field"""
+        update = {'$set': {**fields, 'updated_at': datetime.utcnow()}}
+        defaults = record.insert_defaults(fields)
+        if defaults:
+            update['$setOnInsert'] = defaults
+        return update
+
+    async def get_user_level(self, guild_id: str, user_id: str) -> UserLevel:
+        """Get user level data (the cached record - save changes with set_user_level)"""
+        key = (guild_id, user_id)
+        cached = self.level_cache.get(key)
+        if cached is not None:
+            return cached
+
+        data = await self.levels_col.find_one(
             {'guild_id': guild_id, 'user_id': user_id},
-            {'$set': {
-                'level': data.get('level', 1),
-                'xp': data.get('xp', 0),
-                'lastMessage': data.get('lastMessage', 0),
-                'updated_at': datetime.utcnow()
-            }},
-            upsert=True
+            {field: 1 for field in LEVEL_FIELDS}
         )
+
+        result = self._level_from_doc(data)
+        self.level_cache.put(key, result)
+        return result
+
+    @staticmethod
+    def _level_from_doc(data: Optional[Dict[str, Any]]) -> UserLevel:
+        data = data or {}
+        return UserLevel(**{field: data[field] for field in LEVEL_FIELDS if field in data})
+
+    async def set_user_level(self, guild_id: str, user_id: str, data: Dict[str, Any]):
+        """Set user level data (written back on the next flush)"""
+        key = (guild_id, user_id)
+        if not isinstance(data, UserLevel):
+            record = self.level_cache.get(key) or UserLevel()
+            record.update(data)
+            data = record
+        if data.is_dirty:
+            self.level_cache.mark_dirty(key, data)
+            self._schedule_flush_if_stale()
         logger.debug(f'Updated level for user {user_id} in guild {guild_id}')
-    
-    def get_user_economy(self, guild_id: str, user_id: str) -> Dict[str, Any]:
-        """Get user economy data"""
-        data = self.economy_col.find_one({
+
+    async def get_user_rank(self, guild_id: str, level: int, xp: int) -> int:
+        """Get the leaderboard position for a level/xp pair (indexed count of users ahead)"""
+        ahead = await self.levels_col.count_documents({
             'guild_id': guild_id,
-            'user_id': user_id
+            '$or': [
+                {'level': {'$gt': level}},
+                {'level': level, 'xp': {'$gt': xp}}
+            ]
         })
-        
-        if not data:
-            return {
-                'coins': 0,
-                'bank': 0,
-                'lastDaily': 0,
-                'lastWork': 0
-            }
-        
+        return ahead + 1
+
+    async def get_ranked_user_count(self, guild_id: str) -> int:
+        """Get how many users have level data in a guild (cached briefly)"""
+        cached = self._guild_totals.get(guild_id)
+        now = time.monotonic()
+        if cached and cached[1] > now:
+            return cached[0]
+
+        total = await self.levels_col.count_documents({'guild_id': guild_id, **self._ranked_filter})
+        self._guild_totals[guild_id] = (total, now + Config.RANK_TOTAL_CACHE_TTL)
+        return total
+
+    async def get_leaderboard(self, guild_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get the top users by level/xp with their economy totals in one aggregation"""
+        pipeline = [
+            {'$match': {'guild_id': guild_id, **self._ranked_filter}},
+            {'$sort': {'level': -1, 'xp': -1}},
+            {'$limit': limit}
+        ]
+
+        if self.unified:
+            # Coins already live on the member document
+            pipeline.append({'$set': {'economy': {'coins': '$coins', 'bank': '$bank'}}})
+        else:
+            pipeline += [
+                {'$lookup': {
+                    'from': self.economy_col.name,
+                    'let': {'user_id': '$user_id'},
+                    'pipeline': [
+                        {'$match': {'$expr': {'$and': [
+                            {'$eq': ['$guild_id', guild_id]},
+                            {'$eq': ['$user_id', '$$user_id']}
+                        ]}}},
+                        {'$project': {'_id': 0, 'coins': 1, 'bank': 1}}
+                    ],
+                    'as': 'economy'
+                }},
+                {'$set': {'economy': {'$ifNull': [{'$arrayElemAt': ['$economy', 0]}, {}]}}}
+            ]
+
+        pipeline.append({'$project': {
+            '_id': 0,
+            'user_id': 1,
+            'level': {'$ifNull': ['$level', 1]},
+            'xp': {'$ifNull': ['$xp', 0]},
+            'coins': {'$ifNull': ['$economy.coins', 0]},
+            'bank': {'$ifNull': ['$economy.bank', 0]}
+        }})
+
+        rows = await self.levels_col.aggregate(pipeline).to_list(length=limit)
+        for row in rows:
+            row['total_coins'] = row['coins'] + row['bank']
+        return rows
+
+    @staticmethod
+    def _economy_from_doc(data: Optional[Dict[str, Any]]) -> UserEconomy:
+        """Economy record holding every stored field (minus document metadata)"""
+        return UserEconomy(**{
+            field: value for field, value in (data or {}).items()
+            if field not in RECORD_META_FIELDS + LEVEL_FIELDS + PROFILE_FIELDS + INVENTORY_FIELDS
+        })
+
+    async def get_user_economy(self, guild_id: str, user_id: str) -> UserEconomy:
+        """Get user economy data (cached for ECONOMY_CACHE_TTL - change it with the atomic helpers below)"""
+        key = (guild_id, user_id)
+        cached = self.economy_cache.get(key)
+        if cached is not None:
+            return cached
+
+        data = await self.economy_col.find_one(
+            {'guild_id': guild_id, 'user_id': user_id},
+            self._economy_projection
+        )
+
+        result = self._economy_from_doc(data)
+        self.economy_cache.put(key, result)
+        return result
+
+    async def increment_economy(self, guild_id: str, user_id: str, inc: Dict[str, int],
+                                extra: Dict[str, Dict[str, Any]] = None) -> UserEconomy:
+        """Atomically $inc economy fields and return the new state"""
+        return await self._mutate_economy(guild_id, user_id, self._merge_update(inc, extra))
+
+    async def spend_coins(self, guild_id: str, user_id: str, amount: int, inc: Dict[str, int] = None,
+                          extra: Dict[str, Dict[str, Any]] = None) -> Optional[UserEconomy]:
+        """Atomically take coins if the wallet holds at least amount; None if it doesn't"""
+        update = self._merge_update({'coins': -amount, **(inc or {})}, extra)
+        return await self._mutate_economy(
+            guild_id, user_id, update,
+            conditions={'coins': {'$gte': amount}},
+            upsert=False
+        )
+
+    async def claim_cooldown(self, guild_id: str, user_id: str, field: str, cooldown: float, now: float,
+                             inc: Dict[str, int] = None,
+                             extra: Dict[str, Dict[str, Any]] = None) -> Optional[UserEconomy]:
+        """Atomically set a cooldown timestamp if it is older than cooldown; None if still cooling down"""
+        update = self._merge_update(inc, extra)
+        update.setdefault('$set', {})[field] = now
+        return await self._mutate_economy(
+            guild_id, user_id, update,
+            conditions={'$or': [
+                {field: {'$lte': now - cooldown}},
+                {field: {'$exists': False}}
+            ]}
+        )
+
+    async def bulk_adjust_coins(self, guild_id: str, user_ids: Iterable[str], amount: int,
+                                progress: Callable[[int], Awaitable[None]] = None) -> int:
+        """Add (or, with a negative amount, remove) coins for many users via chunked bulk_writes.
+
+        Removals never take a wallet below zero and don't create records.
+        Returns how many users were processed.
+        """
+        if amount >= 0:
+            update = {'$inc': {'coins': amount}, '$set': {'updated_at': datetime.utcnow()}}
+            upsert = True
+        else:
+            update = [{'$set': {
+                'coins': {'$max': [0, {'$add': [{'$ifNull': ['$coins', 0]}, amount]}]},
+                'updated_at': datetime.utcnow()
+            }}]
+            upsert = False
+
+        done = 0
+        chunk = []
+        for user_id in user_ids:
+            chunk.append(UpdateOne({'guild_id': guild_id, 'user_id': user_id}, update, upsert=upsert))
+            if len(chunk) >= Config.BULK_WRITE_CHUNK_SIZE:
+                await self.economy_col.bulk_write(chunk, ordered=False)
+                done += len(chunk)
+                chunk = []
+                if progress:
+                    await progress(done)
+
+        if chunk:
+            await self.economy_col.bulk_write(chunk, ordered=False)
+            done += len(chunk)
+            if progress:
+                await progress(done)
+
+        # Cached balances for this guild are now stale
+        self.economy_cache.discard(lambda key: key[0] == guild_id)
+        logger.info(f'Adjusted coins by {amount} for {done} users in guild {guild_id}')
+        return done
+
+    @staticmethod
+    def _merge_update(inc: Optional[Dict[str, int]], extra: Optional[Dict[str, Dict[str, Any]]]) -> Dict[str, Any]:
+        update = {op: dict(fields) for op, fields in (extra or {}).items()}
+        if inc:
+            update.setdefault('$inc', {}).update(inc)
+        return update
+
+    async def _mutate_economy(self, guild_id: str, user_id: str, update: Dict[str, Any],
+                              conditions: Dict[str, Any] = None, upsert: bool = True) -> Optional[UserEconomy]:
+        """Run one find_one_and_update on an economy record and refresh the cache from the result"""
+        key = (guild_id, user_id)
+        query = {'guild_id': guild_id, 'user_id': user_id}
+        query.update(conditions or {})
+        update.setdefault('$set', {})['updated_at'] = datetime.utcnow()
+
+        try:
+            data = await self.economy_col.find_one_and_update(
+                query, update,
+                projection=self._economy_projection,
+                upsert=upsert,
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # The record exists but failed the condition, so the upsert tried to insert a duplicate
+            data = None
+
+        if data is None:
+            return None
+
+        result = self._economy_from_doc(data)
+        self.economy_cache.put(key, result)
+        return result
+
+    async def reset_guild_economy(self, guild_id: str):
+        """Delete all economy and inventory data for a guild"""
+        self.economy_cache.discard(lambda key: key[0] == guild_id)
+        if self.unified:
+            # Keep level/profile data; strip everything else off the member documents
+            keep = set(RECORD_META_FIELDS + LEVEL_FIELDS + PROFILE_FIELDS)
+            await self.members_col.update_many(
+                {'guild_id': guild_id},
+                [{'$replaceWith': {'$arrayToObject': {'$filter': {
+                    'input': {'$objectToArray': '$$ROOT'},
+                    'cond': {'$in': ['$$this.k', list(keep)]}
+                }}}}]
+            )
+        else:
+            await self.economy_col.delete_many({'guild_id': guild_id})
+            await self.inventory_col.delete_many({'guild_id': guild_id})
+        logger.info(f'Reset economy for guild {guild_id}')
+
+    async def get_global_stats(self, guild_id: str) -> Dict[str, int]:
+        """Get user and coin totals, globally and for one guild"""
+        coins_pipeline = [
+            {'$group': {
+                '_id': None,
+                'total': {'$sum': {'$add': [{'$ifNull': ['$coins', 0]}, {'$ifNull': ['$bank', 0]}]}}
+            }}
+        ]
+
+        global_coins = await self.economy_col.aggregate(coins_pipeline).to_list(1)
+        server_coins = await self.economy_col.aggregate(
+            [{'$match': {'guild_id': guild_id}}] + coins_pipeline
+        ).to_list(1)
+
         return {
-            'coins': data.get('coins', 0),
-            'bank': data.get('bank', 0),
-            'lastDaily': data.get('lastDaily', 0),
-            'lastWork': data.get('lastWork', 0)
+            'users_global': await self.levels_col.count_documents(self._ranked_filter),
+            'users_server': await self.levels_col.count_documents({'guild_id': guild_id, **self._ranked_filter}),
+            'coins_global': global_coins[0]['total'] if global_coins else 0,
+            'coins_server': server_coins[0]['total'] if server_coins else 0
         }
-    
-    def set_user_economy(self, guild_id: str, user_id: str, data: Dict[str, Any]):
-        """Set user economy data"""
-        self.economy_col.update_one(
+
+    async def get_member(self, guild_id: str, user_id: str, sections=('level', 'economy')) -> Dict[str, Dict[str, Any]]:
+        """Get several kinds of member data at once ('level', 'economy', 'profile', 'inventory').
+
+        Cached level/economy records are served from memory; in unified mode whatever is
+        left comes back in a single projected find_one.
+        """
+        if not self.unified:
+            getters = {
+                'level': self.get_user_level,
+                'economy': self.get_user_economy,
+                'profile': self.get_user_profile,
+                'inventory': self.get_user_inventory
+            }
+            results = await asyncio.gather(*(getters[section](guild_id, user_id) for section in sections))
+            return dict(zip(sections, results))
+
+        key = (guild_id, user_id)
+        result = {}
+        for section, cache in (('level', self.level_cache), ('economy', self.economy_cache)):
+            cached = cache.get(key) if section in sections else None
+            if cached is not None:
+                result[section] = cached
+
+        missing = [section for section in sections if section not in result]
+        if not missing:
+            return result
+
+        data = await self.members_col.find_one(
             {'guild_id': guild_id, 'user_id': user_id},
-            {'$set': {
-                'coins': data.get('coins', 0),
-                'bank': data.get('bank', 0),
-                'lastDaily': data.get('lastDaily', 0),
-                'lastWork': data.get('lastWork', 0),
-                'updated_at': datetime.utcnow()
-            }},
-            upsert=True
+            self._member_projection(missing)
         )
-        logger.debug(f'Updated economy for user {user_id} in guild {guild_id}')
-    
-    def get_user_profile(self, guild_id: str, user_id: str) -> Dict[str, Any]:
-        """Get user profile customizations"""
-        data = self.profiles_col.find_one({
-            'guild_id': guild_id,
-            'user_id': user_id
-        })
-        
-        if not data:
+
+        for section in missing:
+            if section == 'level':
+                result['level'] = self._level_from_doc(data)
+                self.level_cache.put(key, result['level'])
+            elif section == 'economy':
+                result['economy'] = self._economy_from_doc(data)
+                self.economy_cache.put(key, result['economy'])
+            elif section == 'profile':
+                result['profile'] = self._profile_from_doc(data)
+            elif section == 'inventory':
+                result['inventory'] = (data or {}).get('items', {})
+        return result
+
+    @staticmethod
+    def _member_projection(sections) -> Dict[str, int]:
+        fixed = {'level': LEVEL_FIELDS, 'profile': PROFILE_FIELDS, 'inventory': INVENTORY_FIELDS}
+        if 'economy' in sections:
+            # Economy fields are open-ended, so exclude the fixed sections that weren't asked for
+            return {field: 0 for section, fields in fixed.items() if section not in sections for field in fields}
+        return {field: 1 for section in sections for field in fixed[section]}
+
+    @staticmethod
+    def _profile_from_doc(data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if not data or not any(field in data for field in PROFILE_FIELDS):
             return {}
-        
+
         return {
             'customName': data.get('customName'),
             'customPfp': data.get('customPfp')
         }
-    
-    def set_user_profile(self, guild_id: str, user_id: str, profile_data: Dict[str, Any]):
+
+    async def get_user_profile(self, guild_id: str, user_id: str) -> Dict[str, Any]:
+        """Get user profile customizations"""
+        data = await self.profiles_col.find_one(
+            {'guild_id': guild_id, 'user_id': user_id},
+            {field: 1 for field in PROFILE_FIELDS}
+        )
+
+        return self._profile_from_doc(data)
+
+    async def set_user_profile(self, guild_id: str, user_id: str, profile_data: Dict[str, Any]):
         """Set user profile customizations"""
         update_data = {'updated_at': datetime.utcnow()}
-        
+
         if 'customName' in profile_data:
             update_data['customName'] = profile_data['customName']
         if 'customPfp' in profile_data:
             update_data['customPfp'] = profile_data['customPfp']
-        
-        self.profiles_col.update_one(
+
+        await self.profiles_col.update_one(
             {'guild_id': guild_id, 'user_id': user_id},
             {'$set': update_data},
             upsert=True
         )
         logger.debug(f'Updated profile for user {user_id} in guild {guild_id}')
-    
-    def get_bot_profile(self, guild_id: str) -> Dict[str, Any]:
+
+    async def get_bot_profile(self, guild_id: str) -> Dict[str, Any]:
         """Get bot profile customizations for a specific guild"""
-        data = self.bot_profiles_col.find_one({'guild_id': guild_id})
-        
+        data = await self.bot_profiles_col.find_one({'guild_id': guild_id})
+
         if not data:
             return {}
-        
+
         return {
             'customName': data.get('customName'),
             'customPfp': data.get('customPfp')
         }
-    
-    def set_bot_profile(self, guild_id: str, profile_data: Dict[str, Any]):
+
+    async def set_bot_profile(self, guild_id: str, profile_data: Dict[str, Any]):
         """Set bot profile customizations for a specific guild"""
         update_data = {'updated_at': datetime.utcnow()}
-        
+
         if 'customName' in profile_data:
             update_data['customName'] = profile_data['customName']
         if 'customPfp' in profile_data:
             update_data['customPfp'] = profile_data['customPfp']
-        
-        self.bot_profiles_col.update_one(
+
+        await self.bot_profiles_col.update_one(
             {'guild_id': guild_id},
             {'$set': update_data},
             upsert=True
         )
         logger.info(f'Updated bot profile for guild {guild_id}')
-    
-    def get_user_inventory(self, guild_id: str, user_id: str) -> Dict[str, Any]:
+
+    async def get_user_inventory(self, guild_id: str, user_id: str) -> Dict[str, Any]:
         """Get user inventory"""
-        data = self.inventory_col.find_one({
-            'guild_id': guild_id,
-            'user_id': user_id
-        })
-        
+        data = await self.inventory_col.find_one(
+            {'guild_id': guild_id, 'user_id': user_id},
+            {'items': 1}
+        )
+
         if not data:
             return {}
-        
+
         return data.get('items', {})
-    
-    def add_to_inventory(self, guild_id: str, user_id: str, item_id: str):
+
+    async def add_to_inventory(self, guild_id: str, user_id: str, item_id: str):
         """Add item to user inventory"""
         # Get current inventory
-        inv_data = self.inventory_col.find_one({
-            'guild_id': guild_id,
-            'user_id': user_id
-        })
-        
+        inv_data = await self.inventory_col.find_one(
+            {'guild_id': guild_id, 'user_id': user_id},
+            {'items': 1}
+        )
+
         items = inv_data.get('items', {}) if inv_data else {}
-        
+
         # Add or increment item
         if item_id in items:
             items[item_id]['quantity'] = items[item_id].get('quantity', 0) + 1
@@ -207,9 +574,9 @@ class BotData:
                 'purchased': datetime.utcnow().timestamp(),
                 'quantity': 1
             }
-        
+
         # Update in database
-        self.inventory_col.update_one(
+        await self.inventory_col.update_one(
             {'guild_id': guild_id, 'user_id': user_id},
             {'$set': {
                 'items': items,
@@ -218,19 +585,19 @@ class BotData:
             upsert=True
         )
         logger.info(f'Added item {item_id} to user {user_id} in guild {guild_id}')
-    
-    def get_shop_items(self, guild_id: str) -> Dict[str, Any]:
+
+    async def get_shop_items(self, guild_id: str) -> Dict[str, Any]:
         """Get shop items for a guild"""
-        data = self.shop_items_col.find_one({'guild_id': guild_id})
-        
+        data = await self.shop_items_col.find_one({'guild_id': guild_id})
+
         if not data:
             return {}
-        
+
         return data.get('items', {})
-    
-    def set_shop_items(self, guild_id: str, items: Dict[str, Any]):
+
+    async def set_shop_items(self, guild_id: str, items: Dict[str, Any]):
         """Set shop items for a guild"""
-        self.shop_items_col.update_one(
+        await self.shop_items_col.update_one(
             {'guild_id': guild_id},
             {'$set': {
                 'items': items,
@@ -238,103 +605,203 @@ class BotData:
             }},
             upsert=True
         )
-    
-    def get_warnings(self, guild_id: str, user_id: str) -> list:
-        """Get user warnings"""
-        data = self.warnings_col.find_one({
+
+    @staticmethod
+    def _active_warnings(guild_id: str, user_id: str) -> Dict[str, Any]:
+        """Query for a user's unexpired warnings (the TTL monitor only deletes about once a minute)"""
+        return {
             'guild_id': guild_id,
-            'user_id': user_id
-        })
-        
-        if not data:
-            return []
-        
-        return data.get('warnings', [])
-    
-    def add_warning(self, guild_id: str, user_id: str, reason: str, moderator_id: str):
-        """Add warning to user"""
+            'user_id': user_id,
+            '$or': [{'expires_at': {'$gt': datetime.utcnow()}}, {'expires_at': {'$exists': False}}]
+        }
+
+    async def get_warnings(self, guild_id: str, user_id: str, limit: int = 0) -> list:
+        """Get user warnings, newest first"""
+        cursor = self.warnings_col.find(
+            self._active_warnings(guild_id, user_id),
+            {'_id': 0, 'reason': 1, 'moderator_id': 1, 'timestamp': 1}
+        ).sort('timestamp', -1).limit(limit)
+        return await cursor.to_list(length=None)
+
+    async def count_warnings(self, guild_id: str, user_id: str) -> int:
+        """Count a user's active warnings"""
+        return await self.warnings_col.count_documents(self._active_warnings(guild_id, user_id))
+
+    async def add_warning(self, guild_id: str, user_id: str, reason: str, moderator_id: str) -> int:
+        """Add warning to user and return their active warning count"""
+        now = datetime.utcnow()
         warning = {
+            'guild_id': guild_id,
+            'user_id': user_id,
             'reason': reason,
             'moderator_id': moderator_id,
-            'timestamp': datetime.utcnow().timestamp()
+            'timestamp': now.timestamp()
         }
-        
-        self.warnings_col.update_one(
+
+        if Config.WARNING_EXPIRY_DAYS:
+            # Warnings expire one by one, so the counter keeps each live warning's expiry:
+            # one atomic update drops the expired ones and adds this one
+            expires_at = now + timedelta(days=Config.WARNING_EXPIRY_DAYS)
+            warning['expires_at'] = expires_at
+            counter_update = [{'$set': {'expiries': {'$concatArrays': [
+                {'$filter': {'input': {'$ifNull': ['$expiries', []]}, 'cond': {'$gt': ['$$this', now]}}},
+                [expires_at]
+            ]}}}]
+        else:
+            counter_update = {'$inc': {'count': 1}}
+
+        await self.warnings_col.insert_one(warning)
+        counter = await self.warning_counts_col.find_one_and_update(
             {'guild_id': guild_id, 'user_id': user_id},
-            {'$push': {'warnings': warning}},
-            upsert=True
+            counter_update,
+            upsert=True,
+            return_document=ReturnDocument.AFTER
         )
-    
-    def clear_warnings(self, guild_id: str, user_id: str):
+        return len(counter['expiries']) if Config.WARNING_EXPIRY_DAYS else counter['count']
+
+    async def clear_warnings(self, guild_id: str, user_id: str):
         """Clear all warnings for a user"""
-        self.warnings_col.update_one(
-            {'guild_id': guild_id, 'user_id': user_id},
-            {'$set': {'warnings': []}},
+        await self.warnings_col.delete_many({'guild_id': guild_id, 'user_id': user_id})
+        await self.warning_counts_col.delete_one({'guild_id': guild_id, 'user_id': user_id})
+
+    async def get_legacy_video_state(self, guild_id: str) -> Dict[str, Any]:
+        """Old single-channel YouTube state ({} if there is none)"""
+        return await self.videos_col.find_one({'guild_id': guild_id}, {'_id': 0}) or {}
+
+    async def mark_legacy_video_imported(self, guild_id: str):
+        """Flag the old single-channel state as imported so it isn't turned into a subscription again"""
+        await self.videos_col.update_one(
+            {'guild_id': guild_id},
+            {'$set': {'imported_to_subscriptions': True, 'updated_at': datetime.utcnow()}},
             upsert=True
         )
-    
-    def get_last_video_id(self, guild_id: str) -> str:
-        """Get last video ID for YouTube notifications"""
-        data = self.videos_col.find_one({'guild_id': guild_id})
-        
-        if not data:
-            return None
-        
-        return data.get('last_video_id')
-    
-    def set_last_video_id(self, guild_id: str, video_id: str):
-        """Set last video ID for YouTube notifications"""
-        self.videos_col.update_one(
-            {'guild_id': guild_id},
-            {'$set': {
-                'last_video_id': video_id,
-                'updated_at': datetime.utcnow()
-            }},
+
+    async def add_youtube_subscription(self, guild_id: str, youtube_channel_id: str, notify_channel_id: str,
+                                       seen_ids: List[str] = None, last_video_id: str = None) -> bool:
+        """Follow a YouTube channel in a guild; False if it was already followed.
+
+        seen_ids (newest first) are the videos not to announce. Without them only
+        videos newer than last_video_id are announced (nothing if that is unset
+        too) and the rest of the feed is recorded as seen.
+        """
+        doc = {'notify_channel_id': notify_channel_id, 'created_at': datetime.utcnow()}
+        if seen_ids is not None:
+            doc['seen_ids'] = seen_ids[:Config.YOUTUBE_SEEN_IDS][::-1]
+            doc['last_video_id'] = seen_ids[0] if seen_ids else None
+        elif last_video_id:
+            doc['last_video_id'] = last_video_id
+        result = await self.youtube_subs_col.update_one(
+            {'guild_id': guild_id, 'youtube_channel_id': youtube_channel_id},
+            {'$setOnInsert': doc},
             upsert=True
         )
-    
-    def get_leaderboard_message(self, guild_id: str) -> Dict[str, Any]:
+        return result.upserted_id is not None
+
+    async def remove_youtube_subscription(self, guild_id: str, youtube_channel_id: str) -> bool:
+        """Stop following a YouTube channel in a guild"""
+        result = await self.youtube_subs_col.delete_one({'guild_id': guild_id, 'youtube_channel_id': youtube_channel_id})
+        return result.deleted_count > 0
+
+    async def get_youtube_subscriptions(self, guild_id: str = None) -> List[Dict[str, Any]]:
+        """Get YouTube subscriptions for one guild (or every guild)"""
+        query = {'guild_id': guild_id} if guild_id else {}
+        return await self.youtube_subs_col.find(query, {'_id': 0}).to_list(length=None)
+
+    async def add_youtube_seen_videos(self, seen: Dict[tuple, List[str]]):
+        """Append newly seen video IDs (oldest first) per (guild_id, youtube_channel_id) in one bulk_write.
+
+        Each subscription keeps only the newest YOUTUBE_SEEN_IDS entries.
+        """
+        now = datetime.utcnow()
+        ops = [
+            UpdateOne(
+                {'guild_id': guild_id, 'youtube_channel_id': youtube_channel_id},
+                {
+                    '$push': {'seen_ids': {'$each': video_ids, '$slice': -Config.YOUTUBE_SEEN_IDS}},
+                    '$set': {'last_video_id': video_ids[-1], 'updated_at': now}
+                }
+            )
+            for (guild_id, youtube_channel_id), video_ids in seen.items() if video_ids
+        ]
+        if ops:
+            await self.youtube_subs_col.bulk_write(ops, ordered=False)
+
+    async def get_leaderboard_message(self, guild_id: str) -> Dict[str, Any]:
         """Get leaderboard message info"""
-        data = self.leaderboards_col.find_one({'guild_id': guild_id})
-        
+        data = await self.leaderboards_col.find_one({'guild_id': guild_id})
+
         if not data:
             return {}
-        
+
         return {
             'channel_id': data.get('channel_id'),
             'message_id': data.get('message_id')
         }
-    
-    def set_leaderboard_message(self, guild_id: str, channel_id: str, message_id: str):
+
+    async def set_leaderboard_message(self, guild_id: str, channel_id: str, message_id: str, fingerprint: str = None):
         """Set leaderboard message info"""
-        self.leaderboards_col.update_one(
+        await self.leaderboards_col.update_one(
             {'guild_id': guild_id},
             {'$set': {
                 'channel_id': channel_id,
                 'message_id': message_id,
+                'fingerprint': fingerprint,
                 'updated_at': datetime.utcnow()
             }},
             upsert=True
         )
 
+    async def set_leaderboard_fingerprint(self, guild_id: str, fingerprint: str):
+        """Remember what the leaderboard message currently shows"""
+        await self.leaderboards_col.update_one(
+            {'guild_id': guild_id},
+            {'$set': {
+                'fingerprint': fingerprint,
+                'updated_at': datetime.utcnow()
+            }}
+        )
+
+    async def get_leaderboard_messages(self) -> List[Dict[str, Any]]:
+        """Get every stored auto-updating leaderboard message"""
+        return await self.leaderboards_col.find({}).to_list(length=None)
+
+    async def delete_leaderboard_message(self, guild_id: str):
+        """Forget the auto-updating leaderboard message for a guild"""
+        await self.leaderboards_col.delete_one({'guild_id': guild_id})
+
 
 class ReactionRoles:
     """Manages reaction role mappings"""
     def __init__(self):
         self.collection = db['reaction_roles']
+        # (guild_id, message_id, emoji) -> role_id for every mapping, so reactions never hit Mongo
+        self._index: Dict[tuple, str] = {}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
         logger.info('✅ ReactionRoles MongoDB connection initialized')
-    
-    def load(self):
-        """No-op for MongoDB (backwards compatibility)"""
-        pass
-    
-    def save(self):
+
+    async def load(self):
+        """Load every reaction role mapping into memory (once - reactions racing the startup load wait for it)"""
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            index = {}
+            async for doc in self.collection.find({}, {'_id': 0, 'guild_id': 1, 'message_id': 1, 'reactions': 1}):
+                for emoji, role_id in doc.get('reactions', {}).items():
+                    index[(doc['guild_id'], doc['message_id'], emoji)] = role_id
+            self._index = index
+            self._loaded = True
+        logger.info(f'🎭 Loaded {len(self._index)} reaction roles')
+
+    async def save(self):
         """No-op for MongoDB (backwards compatibility)"""
         pass
-    
-    def add_reaction_role(self, guild_id: str, message_id: str, emoji: str, role_id: str):
+
+    async def add_reaction_role(self, guild_id: str, message_id: str, emoji: str, role_id: str):
         """Add a reaction role mapping"""
-        self.collection.update_one(
+        await self.collection.update_one(
             {'guild_id': guild_id, 'message_id': message_id},
             {'$set': {
                 f'reactions.{emoji}': role_id,
@@ -342,61 +809,67 @@ class ReactionRoles:
             }},
             upsert=True
         )
+        self._index[(guild_id, message_id, emoji)] = role_id
         logger.info(f'Added reaction role: {emoji} -> {role_id} in guild {guild_id}')
-    
-    def remove_reaction_role(self, guild_id: str, message_id: str, emoji: str = None):
+
+    async def remove_reaction_role(self, guild_id: str, message_id: str, emoji: str = None):
         """Remove a reaction role mapping"""
         if emoji:
-            self.collection.update_one(
+            await self.collection.update_one(
                 {'guild_id': guild_id, 'message_id': message_id},
                 {'$unset': {f'reactions.{emoji}': ''}}
             )
+            self._index.pop((guild_id, message_id, emoji), None)
         else:
-            self.collection.delete_one({
+            await self.collection.delete_one({
                 'guild_id': guild_id,
                 'message_id': message_id
             })
+            for key in [k for k in self._index if k[0] == guild_id and k[1] == message_id]:
+                del self._index[key]
         logger.info(f'Removed reaction role in guild {guild_id}')
-    
-    def get_role_for_reaction(self, guild_id: str, message_id: str, emoji: str) -> str:
-        """Get role ID for a reaction"""
-        data = self.collection.find_one({
-            'guild_id': guild_id,
-            'message_id': message_id
-        })
-        
-        if not data:
-            return None
-        
-        return data.get('reactions', {}).get(emoji)
+
+    async def get_role_for_reaction(self, guild_id: str, message_id: str, emoji: str) -> str:
+        """Get role ID for a reaction (from the in-memory index)"""
+        await self.load()
+        return self._index.get((guild_id, message_id, emoji))
+
+    async def get_guild_reaction_roles(self, guild_id: str) -> Dict[str, Dict[str, str]]:
+        """Get all reaction role mappings for a guild as {message_id: {emoji: role_id}}"""
+        await self.load()
+
+        result = {}
+        for (key_guild, message_id, emoji), role_id in self._index.items():
+            if key_guild == guild_id:
+                result.setdefault(message_id, {})[emoji] = role_id
+        return result
 
 
 class ServerSettings:
     """Manages per-server settings"""
     def __init__(self):
         self.collection = db['server_settings']
+        # guild_id -> settings dict (an empty dict for guilds without a document)
+        self._cache = TTLCache(Config.SETTINGS_CACHE_TTL, Config.SETTINGS_CACHE_MAX_ENTRIES)
+        self._watch_task: Optional[asyncio.Task] = None
         logger.info('✅ ServerSettings MongoDB connection initialized')
-    
-    def load(self):
+
+    async def load(self):
         """No-op for MongoDB (backwards compatibility)"""
         pass
-    
-    def save(self):
+
+    async def save(self):
         """No-op for MongoDB (backwards compatibility)"""
         pass
-    
-    def get(self, guild_id: str, key: str, default=None):
+
+    async def get(self, guild_id: str, key: str, default=None):
         """Get a setting for a guild"""
-        data = self.collection.find_one({'guild_id': guild_id})
-        
-        if not data:
-            return default
-        
-        return data.get('settings', {}).get(key, default)
-    
-    def set(self, guild_id: str, key: str, value):
+        settings = await self.get_all(guild_id)
+        return settings.get(key, default)
+
+    async def set(self, guild_id: str, key: str, value):
         """Set a setting for a guild"""
-        self.collection.update_one(
+        await self.collection.update_one(
             {'guild_id': guild_id},
             {'$set': {
                 f'settings.{key}': value,
@@ -404,19 +877,164 @@ class ServerSettings:
             }},
             upsert=True
         )
+        self._cache.invalidate(guild_id)
         logger.info(f'Updated setting {key} for guild {guild_id}')
-    
-    def get_all(self, guild_id: str) -> Dict[str, Any]:
-        """Get all settings for a guild"""
-        data = self.collection.find_one({'guild_id': guild_id})
-        
-        if not data:
-            return {}
-        
-        return data.get('settings', {})
+
+    async def get_all(self, guild_id: str) -> Dict[str, Any]:
+        """Get all settings for a guild (read through the cache)"""
+        settings = self._cache.get(guild_id)
+        if settings is not None:
+            return dict(settings)
+
+        data = await self.collection.find_one({'guild_id': guild_id}, {'settings': 1})
+        settings = (data or {}).get('settings', {})
+        self._cache.put(guild_id, settings)
+        return dict(settings)
+
+    def start_watching(self):
+        """Invalidate cached settings when another instance changes them"""
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.create_task(self._watch_changes())
+
+    async def _watch_changes(self):
+        while True:
+            try:
+                async with self.collection.watch(full_document='updateLookup') as stream:
+                    async for change in stream:
+                        guild_id = (change.get('fullDocument') or {}).get('guild_id')
+                        if guild_id is None:
+                            # Deletes don't carry the document, so drop everything
+                            self._cache.clear()
+                        else:
+                            self._cache.invalidate(guild_id)
+            except OperationFailure as e:
+                # Standalone servers have no change streams; cached entries just expire after the TTL
+                logger.warning(f'⚠️ Settings change stream unavailable, relying on cache TTL: {e}')
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f'❌ Settings change stream error: {e}')
+                self._cache.clear()
+                await asyncio.sleep(5)
+
+
+class TimeoutStore:
+    """Active moderation timeouts (saved roles per member), cached per guild"""
+    def __init__(self):
+        self.collection = db['timeouts']
+        # guild_id -> {user_id: timeout record}
+        self._guilds: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.loaded = asyncio.Event()
+        logger.info('✅ TimeoutStore MongoDB connection initialized')
+
+    async def load(self):
+        """Load every active timeout into memory (importing the old JSON file once).
+
+        Failures are logged and `loaded` is always set, so nothing waits on it forever.
+        """
+        try:
+            await self.collection.create_index([('guild_id', 1), ('user_id', 1)], unique=True)
+        except Exception as e:
+            logger.warning(f'⚠️ Could not create timeout indexes: {e}')
+
+        try:
+            await self._import_legacy_file(Config.LEGACY_TIMEOUT_FILE)
+        except Exception as e:
+            logger.error(f'❌ Could not import {Config.LEGACY_TIMEOUT_FILE}: {e}')
+
+        try:
+            guilds = {}
+            async for doc in self.collection.find({}, {'_id': 0}):
+                guilds.setdefault(doc['guild_id'], {})[doc['user_id']] = doc
+            self._guilds = guilds
+            logger.info(f'⏸️ Loaded {sum(len(g) for g in guilds.values())} active timeouts')
+        except Exception as e:
+            logger.error(f'❌ Could not load timeouts: {e}')
+        finally:
+            self.loaded.set()
+
+    async def _import_legacy_file(self, path: str):
+        if not os.path.exists(path):
+            return
+
+        try:
+            with open(path, 'r') as f:
+                legacy = json.load(f)
+        except Exception as e:
+            logger.error(f'❌ Could not read {path}: {e}')
+            return
+
+        ops = []
+        for data in legacy.values():
+            if not isinstance(data, dict) or 'guild_id' not in data or 'user_id' not in data:
+                logger.warning(f'⚠️ Skipping malformed timeout record in {path}: {data!r}')
+                continue
+            record = dict(data, guild_id=str(data['guild_id']), user_id=str(data['user_id']))
+            ops.append(UpdateOne(
+                {'guild_id': record['guild_id'], 'user_id': record['user_id']},
+                {'$setOnInsert': record},
+                upsert=True
+            ))
+        if ops:
+            await self.collection.bulk_write(ops, ordered=False)
+
+        os.replace(path, f'{path}.imported')
+        logger.info(f'📦 Imported {len(ops)} timeouts from {path}')
+
+    def get(self, guild_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get a member's active timeout"""
+        return self._guilds.get(guild_id, {}).get(user_id)
+
+    def get_guild(self, guild_id: str) -> List[Dict[str, Any]]:
+        """Get every active timeout in a guild"""
+        return list(self._guilds.get(guild_id, {}).values())
+
+    def get_expiring(self) -> List[Dict[str, Any]]:
+        """Get every timeout that has an expiry time"""
+        return [
+            record for guild in self._guilds.values() for record in guild.values()
+            if record.get('expires_at')
+        ]
+
+    async def add(self, guild_id: str, user_id: str, data: Dict[str, Any]) -> bool:
+        """Record a timeout; False if the member is already timed out"""
+        record = dict(data, guild_id=guild_id, user_id=user_id)
+        try:
+            await self.collection.insert_one(dict(record))
+        except DuplicateKeyError:
+            return False
+
+        self._guilds.setdefault(guild_id, {})[user_id] = record
+        return True
+
+    async def remove(self, guild_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """Delete a timeout and return it (None if there wasn't one)"""
+        doc = await self.collection.find_one_and_delete(
+            {'guild_id': guild_id, 'user_id': user_id},
+            projection={'_id': 0}
+        )
+        guild = self._guilds.get(guild_id, {})
+        guild.pop(user_id, None)
+        if not guild:
+            self._guilds.pop(guild_id, None)
+        return doc
 
 
 # Global instances
 bot_data = BotData()
 reaction_roles = ReactionRoles()
-server_settings = ServerSettings()
\ No newline at end of file
+server_settings = ServerSettings()
+timeout_store = TimeoutStore()
+
+
+async def setup_database():
+    """Prepare the shared database (indexes, startup loads) - failures are logged, never raised"""
+    await bot_data.ensure_indexes()
+    try:
+        await reaction_roles.load()
+    except Exception as e:
+        # Loaded again on the first reaction
+        logger.error(f'❌ Could not load reaction roles: {e}')
+    await timeout_store.load()
+    server_settings.start_watching()
@@ -0,0 +1,121 @@
+"""Conditional-GET fetcher and streaming parser for YouTube Atom feeds"""
+import logging
+from typing import Collection, Dict, List, Optional, Tuple
+from xml.etree.ElementTree import XMLPullParser
+import aiohttp
+from utils.config import Config
+
+logger = logging.getLogger('tooly_bot.feeds')
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+YT = '{http://www.youtube.com/xml/schemas/2015}'
+MEDIA = '{http://search.yahoo.com/mrss/}'
+
+
+class FeedEntry:
+    """One video from a channel feed"""
+
+    __slots__ = ('id', 'video_id', 'channel_id', 'title', 'link', 'author', 'published', 'thumbnail')
+
+    def __init__(self, elem):
+        self.id = elem.findtext(f'{ATOM}id')
+        self.video_id = elem.findtext(f'{YT}videoId')
+        self.channel_id = elem.findtext(f'{YT}channelId')
+        self.title = elem.findtext(f'{ATOM}title', '')
+        self.author = elem.findtext(f'{ATOM}author/{ATOM}name', '')
+        self.published = elem.findtext(f'{ATOM}published', '')
+
+        link = elem.find(f'{ATOM}link[@rel="alternate"]')
+        self.link = link.get('href') if link is not None else f'https://www.youtube.com/watch?v={self.video_id}'
+
+        thumbnail = elem.find(f'{MEDIA}group/{MEDIA}thumbnail')
+        self.thumbnail = thumbnail.get('url') if thumbnail is not None else None
+
+    def __repr__(self):
+        return f'FeedEntry({self.id!r}, {self.title!r})'
+
+
+def parse_entries(parser: XMLPullParser, stop_ids: Collection[str], max_entries: Optional[int],
+                  entries: List[FeedEntry]) -> bool:
+    """Collect finished <entry> elements; True once a known id or the entry limit is reached"""
+    for event, elem in parser.read_events():
+        if elem.tag != f'{ATOM}entry':
+            continue
+
+        entry = FeedEntry(elem)
+        elem.clear()
+        if entry.id in stop_ids:
+            return True
+        entries.append(entry)
+        if max_entries and len(entries) >= max_entries:
+            return True
+    return False
+
+
+def parse_feed(body: bytes) -> List[FeedEntry]:
+    """Entries of a complete feed document (e.g. a WebSub push)"""
+    parser = XMLPullParser(events=('end',))
+    entries: List[FeedEntry] = []
+    parser.feed(body)
+    parser.close()
+    parse_entries(parser, (), None, entries)
+    return entries
+
+
+class FeedFetcher:
+    """Fetches feeds over one pooled aiohttp session, remembering ETag/Last-Modified per URL.
+
+    Unchanged feeds come back as a bodyless 304, and changed ones are parsed
+    incrementally and only up to the first entry the caller has already seen
+    (feeds list newest first).
+    """
+
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._validators: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=Config.FEED_FETCH_TIMEOUT),
+                headers={'User-Agent': 'ToolyBot'}
+            )
+        return self._session
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    def forget(self, url: str):
+        """Drop the stored validators so the next fetch downloads the feed again"""
+        self._validators.pop(url, None)
+
+    async def fetch(self, url: str, stop_ids: Collection[str] = (), max_entries: Optional[int] = None,
+                    conditional: bool = True) -> Optional[List[FeedEntry]]:
+        """New entries newest-first, or None if the feed hasn't changed since the last fetch"""
+        headers = {}
+        etag, last_modified = self._validators.get(url, (None, None)) if conditional else (None, None)
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        async with self._get_session().get(url, headers=headers) as resp:
+            if resp.status == 304:
+                return None
+            resp.raise_for_status()
+
+            parser = XMLPullParser(events=('end',))
+            entries: List[FeedEntry] = []
+            async for chunk in resp.content.iter_chunked(8192):
+                parser.feed(chunk)
+                if parse_entries(parser, stop_ids, max_entries, entries):
+                    break
+            else:
+                parser.close()
+                parse_entries(parser, stop_ids, max_entries, entries)
+
+            # Out-of-band (unconditional) reads mustn't hand the poller a 304 for entries it hasn't seen
+            if conditional:
+                self._validators[url] = (resp.headers.get('ETag'), resp.headers.get('Last-Modified'))
+            return entries
@@ -0,0 +1,58 @@
+"""Copy split levels/economy/profiles/inventory collections into unified member documents.
+
+Usage: python -m utils.migrate_members
+
+Safe to re-run: every source document is upserted onto its (guild_id, user_id)
+member document with $set, so running it twice produces the same result.
+Set UNIFIED_MEMBER_STORAGE=true once it has finished.
+"""
+import asyncio
+import logging
+from pymongo import UpdateOne
+from utils.database import db
+from utils.config import Config
+
+logger = logging.getLogger('tooly_bot.migrate')
+
+SOURCE_COLLECTIONS = ('levels', 'economy', 'profiles', 'inventory')
+
+
+async def migrate_collection(name: str) -> int:
+    """Upsert every document of one split collection into members"""
+    members = db['members']
+    ops = []
+    migrated = 0
+
+    async for doc in db[name].find({}, {'_id': 0}):
+        guild_id, user_id = doc.pop('guild_id', None), doc.pop('user_id', None)
+        if guild_id is None or user_id is None:
+            continue
+
+        doc.pop('updated_at', None)
+        if not doc:
+            continue
+
+        ops.append(UpdateOne({'guild_id': guild_id, 'user_id': user_id}, {'$set': doc}, upsert=True))
+        if len(ops) >= Config.BULK_WRITE_CHUNK_SIZE:
+            await members.bulk_write(ops, ordered=False)
+            migrated += len(ops)
+            ops = []
+
+    if ops:
+        await members.bulk_write(ops, ordered=False)
+        migrated += len(ops)
+    return migrated
+
+
+async def migrate():
+    await db['members'].create_index([('guild_id', 1), ('user_id', 1)], unique=True)
+    await db['members'].create_index([('guild_id', 1), ('level', -1), ('xp', -1)])
+
+    for name in SOURCE_COLLECTIONS:
+        count = await migrate_collection(name)
+        logger.info(f'✅ Migrated {count} documents from {name}')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(migrate())
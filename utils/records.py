@@ -0,0 +1,126 @@
+"""Compact per-user records with dirty-field tracking"""
+from typing import Any, Dict, Iterable
+
+
+def _changed(current: Any, value: Any) -> bool:
+    # A dict/list reassigned to itself was probably mutated in place
+    if value is current:
+        return isinstance(value, (dict, list))
+    return value != current
+
+
+class Record:
+    """Slotted record that remembers which fields changed since the last write.
+
+    Records also behave like the dicts cogs used to receive (record['coins'],
+    record.get('fishCaught', 0), record['xp'] += 10). Only top-level assignments
+    are tracked, so reassign a nested value after mutating it.
+    """
+
+    __slots__ = ('_dirty',)
+    DEFAULTS: Dict[str, Any] = {}
+
+    def __init__(self, **values):
+        object.__setattr__(self, '_dirty', set())
+        for field, default in self.DEFAULTS.items():
+            object.__setattr__(self, field, values.pop(field, default))
+        for field, value in values.items():
+            self._load_extra(field, value)
+
+    def _load_extra(self, field: str, value: Any):
+        raise KeyError(field)
+
+    def __setattr__(self, field: str, value: Any):
+        current = getattr(self, field, None)
+        object.__setattr__(self, field, value)
+        if _changed(current, value):
+            self._dirty.add(field)
+
+    def __getitem__(self, field: str) -> Any:
+        if field not in self.DEFAULTS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def __setitem__(self, field: str, value: Any):
+        if field not in self.DEFAULTS:
+            raise KeyError(field)
+        setattr(self, field, value)
+
+    def __contains__(self, field: str) -> bool:
+        return field in self.DEFAULTS
+
+    def get(self, field: str, default: Any = None) -> Any:
+        try:
+            return self[field]
+        except KeyError:
+            return default
+
+    def update(self, values: Dict[str, Any]):
+        for field, value in values.items():
+            self[field] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self.DEFAULTS}
+
+    @property
+    def is_dirty(self) -> bool:
+        return bool(self._dirty)
+
+    def take_dirty(self) -> Dict[str, Any]:
+        """Pop the changed fields and their current values"""
+        fields = {field: self[field] for field in self._dirty}
+        self._dirty.clear()
+        return fields
+
+    def restore_dirty(self, fields: Iterable[str]):
+        """Mark fields changed again after a failed write"""
+        self._dirty.update(fields)
+
+    def insert_defaults(self, written: Iterable[str]) -> Dict[str, Any]:
+        """Defaults for the core fields a write leaves out (for $setOnInsert)"""
+        written = set(written)
+        return {field: default for field, default in self.DEFAULTS.items() if field not in written}
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.to_dict()!r})'
+
+
+class UserLevel(Record):
+    """Level/XP record for one member"""
+
+    __slots__ = ('level', 'xp', 'lastMessage')
+    DEFAULTS = {'level': 1, 'xp': 0, 'lastMessage': 0}
+
+
+class UserEconomy(Record):
+    """Economy record for one member; stats added by cogs live in `extra`.
+
+    A read-only snapshot - economy changes go through BotData's atomic helpers.
+    """
+
+    __slots__ = ('coins', 'bank', 'lastDaily', 'lastWork', 'extra')
+    DEFAULTS = {'coins': 0, 'bank': 0, 'lastDaily': 0, 'lastWork': 0}
+
+    def __init__(self, **values):
+        object.__setattr__(self, 'extra', {})
+        super().__init__(**values)
+
+    def _load_extra(self, field: str, value: Any):
+        self.extra[field] = value
+
+    def __getitem__(self, field: str) -> Any:
+        if field in self.DEFAULTS:
+            return getattr(self, field)
+        return self.extra[field]
+
+    def __setitem__(self, field: str, value: Any):
+        if field in self.DEFAULTS:
+            setattr(self, field, value)
+            return
+        self.extra[field] = value
+
+    def __contains__(self, field: str) -> bool:
+        return field in self.DEFAULTS or field in self.extra
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**super().to_dict(), **self.extra}
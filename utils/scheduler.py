@@ -0,0 +1,92 @@
+"""Single-task scheduler for timed jobs"""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger('tooly_bot.scheduler')
+
+
+class Scheduler:
+    """Runs coroutine callbacks at wall-clock times from one sleeping task.
+
+    Jobs sit in a min-heap keyed by due time; the runner sleeps until the
+    earliest one (or until an earlier job is scheduled). Scheduling a key
+    again replaces its previous job.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._jobs: Dict[Hashable, Tuple[float, int, Callable[[], Awaitable[None]]]] = {}
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._jobs
+
+    def schedule(self, key: Hashable, when: float, callback: Callable[[], Awaitable[None]]):
+        """Run callback() at timestamp `when` (replacing any job with the same key)"""
+        seq = next(self._counter)
+        self._jobs[key] = (when, seq, callback)
+        heapq.heappush(self._heap, (when, seq, key))
+        if self._heap[0][1] == seq:
+            self._wakeup.set()
+
+    def cancel(self, key: Hashable):
+        # The heap entry is skipped lazily once it reaches the top
+        self._jobs.pop(key, None)
+
+    def next_due(self, key: Hashable) -> Optional[float]:
+        job = self._jobs.get(key)
+        return job[0] if job else None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def _pop_stale(self):
+        while self._heap:
+            when, seq, key = self._heap[0]
+            job = self._jobs.get(key)
+            if job is not None and job[1] == seq:
+                return
+            heapq.heappop(self._heap)
+
+    async def _run(self):
+        while True:
+            self._pop_stale()
+            self._wakeup.clear()
+
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            when, seq, key = heapq.heappop(self._heap)
+            _, _, callback = self._jobs.pop(key)
+            asyncio.create_task(self._fire(key, callback))
+
+    async def _fire(self, key: Hashable, callback: Callable[[], Awaitable[None]]):
+        try:
+            await callback()
+        except Exception as e:
+            logger.error(f'❌ Scheduled job {key} in {self.name} failed: {e}', exc_info=True)
@@ -0,0 +1,198 @@
+"""WebSub (PubSubHubbub) subscriber client and a local hub stand-in"""
+import asyncio
+import hmac
+import logging
+import secrets
+import time
+from typing import Dict, Optional, Set, Tuple
+import aiohttp
+from aiohttp import web
+from utils.config import Config
+
+logger = logging.getLogger('tooly_bot.websub')
+
+SIGNATURE_ALGORITHMS = ('sha1', 'sha256', 'sha384', 'sha512')
+
+
+def sign(secret: str, body: bytes, algorithm: str = 'sha1') -> str:
+    """X-Hub-Signature header value for a body"""
+    return f'{algorithm}={hmac.new(secret.encode(), body, algorithm).hexdigest()}'
+
+
+class WebSubClient:
+    """Subscribes a callback URL to topics on a hub and checks what the hub sends back.
+
+    The hub confirms (un)subscribe requests by calling the callback with a
+    challenge, which is only echoed for requests this client actually made.
+    Pushed bodies are signed with the shared secret.
+    """
+
+    def __init__(self, hub_url: str, callback_url: str, secret: Optional[str] = None,
+                 lease_seconds: int = Config.WEBSUB_LEASE_SECONDS):
+        self.hub_url = hub_url
+        self.callback_url = callback_url
+        self.secret = secret or secrets.token_hex(32)
+        self.lease_seconds = lease_seconds
+        self.leases: Dict[str, float] = {}  # topic -> expiry timestamp
+        self._pending: Dict[str, Tuple[str, float]] = {}  # topic -> (mode, requested at) awaiting hub verification
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=Config.FEED_FETCH_TIMEOUT))
+        return self._session
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    def is_active(self, topic: str) -> bool:
+        return self.leases.get(topic, 0) > time.time()
+
+    def _pending_mode(self, topic: str) -> Optional[str]:
+        """Mode of an outstanding request (a verification that never came expires)"""
+        pending = self._pending.get(topic)
+        if pending is None:
+            return None
+        mode, requested_at = pending
+        if time.time() - requested_at > Config.WEBSUB_VERIFY_TIMEOUT:
+            del self._pending[topic]
+            return None
+        return mode
+
+    def is_pending(self, topic: str) -> bool:
+        return self._pending_mode(topic) is not None
+
+    async def subscribe(self, topic: str):
+        await self._request('subscribe', topic)
+
+    async def unsubscribe(self, topic: str):
+        self.leases.pop(topic, None)
+        await self._request('unsubscribe', topic)
+
+    async def _request(self, mode: str, topic: str):
+        data = {
+            'hub.mode': mode,
+            'hub.topic': topic,
+            'hub.callback': self.callback_url,
+            'hub.verify': 'async'
+        }
+        if mode == 'subscribe':
+            data['hub.secret'] = self.secret
+            data['hub.lease_seconds'] = str(self.lease_seconds)
+
+        self._pending[topic] = (mode, time.time())
+        try:
+            async with self._get_session().post(self.hub_url, data=data) as resp:
+                if resp.status not in (202, 204):
+                    raise RuntimeError(f'hub answered {resp.status}: {(await resp.text())[:200]}')
+        except Exception:
+            self._pending.pop(topic, None)
+            raise
+
+    def verify_intent(self, mode: str, topic: str, lease_seconds: Optional[int] = None) -> bool:
+        """True if the hub's challenge matches a request we made (the challenge should then be echoed)"""
+        if mode not in ('subscribe', 'unsubscribe') or self._pending_mode(topic) != mode:
+            return False
+        del self._pending[topic]
+
+        if mode == 'subscribe':
+            self.leases[topic] = time.time() + (lease_seconds or self.lease_seconds)
+        else:
+            self.leases.pop(topic, None)
+        return True
+
+    def deny(self, topic: str):
+        """The hub refused a subscription"""
+        self._pending.pop(topic, None)
+        self.leases.pop(topic, None)
+
+    def check_signature(self, body: bytes, header: Optional[str]) -> bool:
+        if not header or '=' not in header:
+            return False
+        algorithm, _, digest = header.partition('=')
+        if algorithm not in SIGNATURE_ALGORITHMS:
+            return False
+        return hmac.compare_digest(sign(self.secret, body, algorithm), f'{algorithm}={digest}')
+
+
+class LocalHub:
+    """In-process WebSub hub for exercising a callback without a public hub.
+
+    Verifies (un)subscribe requests against the callback like a real hub and
+    delivers signed bodies with publish().
+    """
+
+    def __init__(self):
+        self.subscriptions: Dict[Tuple[str, str], Optional[str]] = {}  # (topic, callback) -> secret
+        self.app = web.Application()
+        self.app.router.add_post('/', self.handle_request)
+        self._runner: Optional[web.AppRunner] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Serve the hub and return its URL"""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self._session = aiohttp.ClientSession()
+        host, port = self._runner.addresses[0][:2]
+        return f'http://{host}:{port}/'
+
+    async def stop(self):
+        await self.drain()
+        if self._session:
+            await self._session.close()
+        if self._runner:
+            await self._runner.cleanup()
+
+    async def drain(self):
+        """Wait for outstanding verifications"""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def handle_request(self, request):
+        form = await request.post()
+        mode = form.get('hub.mode')
+        topic = form.get('hub.topic')
+        callback = form.get('hub.callback')
+        if mode not in ('subscribe', 'unsubscribe') or not topic or not callback:
+            return web.Response(status=400, text='hub.mode, hub.topic and hub.callback are required')
+
+        task = asyncio.create_task(self._verify(mode, topic, callback, form.get('hub.secret'),
+                                                form.get('hub.lease_seconds')))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return web.Response(status=202)
+
+    async def _verify(self, mode: str, topic: str, callback: str, secret: Optional[str], lease_seconds: Optional[str]):
+        challenge = secrets.token_hex(16)
+        params = {'hub.mode': mode, 'hub.topic': topic, 'hub.challenge': challenge}
+        if mode == 'subscribe':
+            params['hub.lease_seconds'] = lease_seconds or str(Config.WEBSUB_LEASE_SECONDS)
+
+        async with self._session.get(callback, params=params) as resp:
+            confirmed = resp.status == 200 and await resp.text() == challenge
+
+        if not confirmed:
+            logger.info(f'🔕 Local hub: {callback} did not confirm {mode} for {topic}')
+            return
+        if mode == 'subscribe':
+            self.subscriptions[(topic, callback)] = secret
+        else:
+            self.subscriptions.pop((topic, callback), None)
+
+    async def publish(self, topic: str, body: bytes) -> Dict[str, int]:
+        """Deliver a body to every subscriber of a topic; returns callback -> status"""
+        statuses = {}
+        for (subscribed_topic, callback), secret in list(self.subscriptions.items()):
+            if subscribed_topic != topic:
+                continue
+            headers = {'Content-Type': 'application/atom+xml'}
+            if secret:
+                headers['X-Hub-Signature'] = sign(secret, body)
+            async with self._session.post(callback, data=body, headers=headers) as resp:
+                statuses[callback] = resp.status
+        return statuses